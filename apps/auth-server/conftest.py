@@ -49,10 +49,16 @@ def test_engine():
     # Enable foreign keys for SQLite
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_conn, connection_record):
+        # Let SQLAlchemy emit BEGIN itself so per-test SAVEPOINTs work with pysqlite
+        dbapi_conn.isolation_level = None
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
         cursor.close()
 
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     yield engine
 
     # Cleanup: dispose engine after all tests
@@ -86,18 +92,19 @@ def setup_auth_tables(test_engine):
 def db_session(test_engine, TestSessionLocal, setup_auth_tables):
     """
     Create a new database session for each test function.
-    Truncates all tables after each test for isolation.
+    The session runs inside an outer transaction that is rolled back after
+    the test; commits made by the code under test only release SAVEPOINTs,
+    so no per-test COMMIT or table truncation is needed for isolation.
     """
-    session = TestSessionLocal()
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    session = TestSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
 
     yield session
 
-    # Truncate all tables after test
-    for table in reversed(Base.metadata.sorted_tables):
-        session.execute(table.delete())
-    session.commit()
-
     session.close()
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture(scope="function")
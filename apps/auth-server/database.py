@@ -27,10 +27,12 @@ engine_kwargs = {}
 if DATABASE_URL.startswith("sqlite"):
     engine_kwargs["connect_args"] = {"check_same_thread": False}
 else:
-    # PostgreSQL pooling settings
-    engine_kwargs["pool_size"] = 10
-    engine_kwargs["max_overflow"] = 20
+    # PostgreSQL pooling settings - size x workers must stay under the server's
+    # max_connections (100 by default), so they come from configuration
+    engine_kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "10"))
+    engine_kwargs["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "20"))
     engine_kwargs["pool_pre_ping"] = True  # Verify connections before using
+    engine_kwargs["pool_recycle"] = 1800  # Replace connections before server-side timeouts
 
 engine = create_engine(DATABASE_URL, **engine_kwargs)
 
@@ -6,6 +6,7 @@ from .pipeline_behaviors import (
     AuthorizationBehavior,
     CachingBehavior,
     CircuitBreakerBehavior,
+    ConcurrencyLimitBehavior,
     IPipelineBehavior,
     LoggingBehavior,
     OutboxBehavior,
@@ -23,5 +24,6 @@ __all__ = [
     "CachingBehavior",
     "RateLimitingBehavior",
     "CircuitBreakerBehavior",
+    "ConcurrencyLimitBehavior",
     "OutboxBehavior",
 ]
@@ -3,9 +3,11 @@ Enterprise pipeline behaviors for CQRS commands and queries
 """
 
 import asyncio
+import inspect
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable
 from typing import TypeVar
 
@@ -17,6 +19,13 @@ TResponse = TypeVar("TResponse")
 logger = logging.getLogger(__name__)
 
 
+async def _maybe_await(result):
+    """Await result if it is awaitable (AsyncSession methods), else return it as is"""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
 class IPipelineBehavior(ABC):
     """Base interface for pipeline behaviors"""
 
@@ -154,7 +163,7 @@ class TransactionBehavior(IPipelineBehavior):
         """Manage database transactions"""
 
         # Check if request requires transaction
-        if not hasattr(request, "requires_transaction") or not request.requires_transaction:
+        if not getattr(request, "requires_transaction", False):
             return await next_handler()
 
         # Get database session from request context
@@ -165,29 +174,35 @@ class TransactionBehavior(IPipelineBehavior):
             )
             return await next_handler()
 
+        # Session and AsyncSession are both supported - the latter returns awaitables
         try:
             # Begin transaction if not already started
             if not db_session.in_transaction():
-                db_session.begin()
+                await _maybe_await(db_session.begin())
 
             response = await next_handler()
 
             # Auto-commit if enabled
             if self.auto_commit:
-                db_session.commit()
+                await _maybe_await(db_session.commit())
                 logger.debug(f"Transaction committed for {type(request).__name__}")
 
             return response
 
         except Exception as e:
-            # Rollback on any error
-            db_session.rollback()
+            # Rollback on any error, finished before raising so a caller reusing the
+            # session never races the ROLLBACK
+            await _maybe_await(db_session.rollback())
             logger.error(f"Transaction rolled back for {type(request).__name__}: {e}")
             from ..exceptions.pipeline_exceptions import TransactionPipelineException
 
             raise TransactionPipelineException(type(request).__name__, "rollback", e) from e
 
 
+class _LeaderCancelled(Exception):
+    """Set on an in-flight miss whose computing request was cancelled - waiters retry"""
+
+
 class CachingBehavior(IPipelineBehavior):
     """Enterprise caching behavior with TTL and cache invalidation"""
 
@@ -195,6 +210,8 @@ class CachingBehavior(IPipelineBehavior):
         self.cache_ttl = cache_ttl
         self.enable_caching = enable_caching
         self._cache: dict[str, tuple[float, any]] = {}
+        # Misses currently being computed - concurrent callers share one handler call
+        self._inflight: dict[str, asyncio.Future] = {}
 
     async def handle(
         self, request: TRequest, next_handler: Callable[[], Awaitable[TResponse]]
@@ -202,33 +219,86 @@ class CachingBehavior(IPipelineBehavior):
         """Cache query results"""
 
         # Only cache queries, not commands
-        if not hasattr(request, "cache_key") or not self.enable_caching:
+        if not self.enable_caching:
             return await next_handler()
 
-        cache_key = request.cache_key
-        current_time = time.time()
+        cache_key = getattr(request, "cache_key", None)
+        if cache_key is None:
+            return await next_handler()
 
-        # Check cache
-        if cache_key in self._cache:
-            cached_time, cached_result = self._cache[cache_key]
-            if current_time - cached_time < self.cache_ttl:
+        # Check cache - expired entries are evicted lazily on read
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            cached_time, cached_result = cached
+            if time.time() - cached_time < self.cache_ttl:
                 logger.debug(f"Cache hit for {type(request).__name__}: {cache_key}")
                 return cached_result
+            del self._cache[cache_key]
 
-        # Execute handler and cache result
-        response = await next_handler()
-        self._cache[cache_key] = (current_time, response)
+        # Join an in-flight miss for the same key instead of calling the handler again. If
+        # the request computing it is cancelled, the next waiter takes over the miss.
+        while (inflight := self._inflight.get(cache_key)) is not None:
+            logger.debug(f"Awaiting in-flight result for {type(request).__name__}: {cache_key}")
+            try:
+                return await asyncio.shield(inflight)
+            except _LeaderCancelled:
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+
+        # Execute handler and cache the awaited result
+        try:
+            response = await next_handler()
+        except asyncio.CancelledError:
+            # Only this caller went away - don't cancel the requests waiting on it
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited future doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            del self._inflight[cache_key]
+
+        self._cache[cache_key] = (time.time(), response)
+        future.set_result(response)
         logger.debug(f"Cached result for {type(request).__name__}: {cache_key}")
 
         return response
 
 
-class RateLimitingBehavior(IPipelineBehavior):
-    """Enterprise rate limiting per user/workspace"""
+class _BucketState:
+    """Per-key token bucket state"""
+
+    __slots__ = ("tokens", "last_ns")
+
+    def __init__(self, tokens: int, last_ns: int):
+        self.tokens = tokens
+        self.last_ns = last_ns
+
 
-    def __init__(self, requests_per_minute: int = 60):
+class RateLimitingBehavior(IPipelineBehavior):
+    """Enterprise rate limiting per user/workspace using a token bucket"""
+
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        burst: int | None = None,
+        max_tracked_keys: int = 100_000,
+    ):
         self.requests_per_minute = requests_per_minute
-        self._request_counts: dict[str, list[float]] = {}
+        # Bucket capacity - lower it to smooth out bursts (defaults to a full minute)
+        self.burst = burst if burst is not None else requests_per_minute
+        # Integer nanoseconds per refilled token - keeps the hot path free of float math
+        self._refill_ns_per_token = (
+            60 * 1_000_000_000 // requests_per_minute if requests_per_minute > 0 else 0
+        )
+        # Least recently used keys are evicted past max_tracked_keys (they restart full)
+        self.max_tracked_keys = max_tracked_keys
+        self._buckets: OrderedDict[str, _BucketState] = OrderedDict()
 
     async def handle(
         self, request: TRequest, next_handler: Callable[[], Awaitable[TResponse]]
@@ -240,39 +310,72 @@ class RateLimitingBehavior(IPipelineBehavior):
         if not rate_limit_key:
             return await next_handler()
 
-        current_time = time.time()
-        one_minute_ago = current_time - 60
-
-        # Clean old requests
-        if rate_limit_key in self._request_counts:
-            self._request_counts[rate_limit_key] = [
-                req_time
-                for req_time in self._request_counts[rate_limit_key]
-                if req_time > one_minute_ago
-            ]
+        capacity = self.burst
+        now = time.monotonic_ns()
+
+        # Refill the bucket for the time elapsed since the last request.
+        # No await between read and write, so no lock is needed on the event loop.
+        buckets = self._buckets
+        bucket = buckets.get(rate_limit_key)
+        if bucket is None:
+            bucket = buckets[rate_limit_key] = _BucketState(capacity, now)
+            if len(buckets) > self.max_tracked_keys:
+                buckets.popitem(last=False)
         else:
-            self._request_counts[rate_limit_key] = []
+            buckets.move_to_end(rate_limit_key)
+            if self._refill_ns_per_token:
+                earned = (now - bucket.last_ns) // self._refill_ns_per_token
+                if bucket.tokens + earned >= capacity:
+                    bucket.tokens = capacity
+                    bucket.last_ns = now
+                elif earned:
+                    bucket.tokens += earned
+                    # Advance by whole tokens only so partial refills carry over
+                    bucket.last_ns += earned * self._refill_ns_per_token
 
         # Check rate limit
-        if len(self._request_counts[rate_limit_key]) >= self.requests_per_minute:
+        if bucket.tokens < 1:
             from ..exceptions.pipeline_exceptions import RateLimitExceededException
 
             raise RateLimitExceededException(rate_limit_key, self.requests_per_minute)
 
-        # Record request
-        self._request_counts[rate_limit_key].append(current_time)
+        # Consume a token for this request
+        bucket.tokens -= 1
 
         return await next_handler()
 
 
+_CIRCUIT_CLOSED = 0
+_CIRCUIT_OPEN = 1
+_CIRCUIT_HALF_OPEN = 2
+
+
+class _CircuitState:
+    """Per-key circuit breaker state"""
+
+    __slots__ = ("state", "failures", "opened_at")
+
+    def __init__(self):
+        self.state = _CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_at = 0
+
+
 class CircuitBreakerBehavior(IPipelineBehavior):
     """Enterprise circuit breaker pattern for external service calls"""
 
-    def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60):
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: int = 60,
+        max_tracked_keys: int = 10_000,
+    ):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
-        self._failure_counts: dict[str, int] = {}
-        self._last_failure_times: dict[str, float] = {}
+        self._recovery_ns = int(recovery_timeout * 1_000_000_000)
+        # Least recently used circuits are evicted past max_tracked_keys (they restart closed)
+        self.max_tracked_keys = max_tracked_keys
+        self._circuits: OrderedDict[str, _CircuitState] = OrderedDict()
 
     async def handle(
         self, request: TRequest, next_handler: Callable[[], Awaitable[TResponse]]
@@ -284,45 +387,88 @@ class CircuitBreakerBehavior(IPipelineBehavior):
         if not circuit_key:
             return await next_handler()
 
-        current_time = time.time()
-
-        # Check if circuit is open
-        if circuit_key in self._failure_counts:
-            failure_count = self._failure_counts[circuit_key]
-            last_failure_time = self._last_failure_times.get(circuit_key, 0)
-
-            if (
-                failure_count >= self.failure_threshold
-                and current_time - last_failure_time < self.recovery_timeout
-            ):
+        # Closed circuits (the common case) fall straight through to the handler
+        circuit = self._circuits.get(circuit_key)
+        if circuit is not None:
+            self._circuits.move_to_end(circuit_key)
+        if circuit is not None and circuit.state == _CIRCUIT_OPEN:
+            if time.monotonic_ns() - circuit.opened_at < self._recovery_ns:
                 from ..exceptions.pipeline_exceptions import CircuitBreakerOpenException
 
                 raise CircuitBreakerOpenException(
-                    circuit_key, failure_count, self.failure_threshold
+                    circuit_key, circuit.failures, self.failure_threshold
                 )
+            # Recovery timeout elapsed - let requests probe the service
+            circuit.state = _CIRCUIT_HALF_OPEN
 
         try:
             response = await next_handler()
-            # Reset failure count on success
-            self._failure_counts[circuit_key] = 0
-            return response
-
         except Exception:
-            # Increment failure count
-            self._failure_counts[circuit_key] = self._failure_counts.get(circuit_key, 0) + 1
-            self._last_failure_times[circuit_key] = current_time
-            logger.warning(
-                f"Circuit breaker failure for {circuit_key}: {self._failure_counts[circuit_key]}/{self.failure_threshold}"
-            )
+            self._record_failure(circuit_key)
             raise
 
+        # Reset failure count on success
+        if circuit is not None and (circuit.failures or circuit.state != _CIRCUIT_CLOSED):
+            circuit.failures = 0
+            circuit.state = _CIRCUIT_CLOSED
+        return response
+
+    def _record_failure(self, circuit_key: str) -> None:
+        """Count a failure and open the circuit at the threshold or on a failed probe"""
+        circuit = self._circuits.get(circuit_key)
+        if circuit is None:
+            circuit = self._circuits[circuit_key] = _CircuitState()
+            if len(self._circuits) > self.max_tracked_keys:
+                self._circuits.popitem(last=False)
+
+        circuit.failures += 1
+        if circuit.state == _CIRCUIT_HALF_OPEN or circuit.failures >= self.failure_threshold:
+            circuit.state = _CIRCUIT_OPEN
+            circuit.opened_at = time.monotonic_ns()
+
+        logger.warning(
+            f"Circuit breaker failure for {circuit_key}: {circuit.failures}/{self.failure_threshold}"
+        )
+
+
+class ConcurrencyLimitBehavior(IPipelineBehavior):
+    """
+    Bulkhead that caps in-flight requests per backend
+
+    Requests carrying the same concurrency_limit_key share max_concurrent slots; extra ones
+    wait. A backend worker that is already busy gets slower per request as more are queued
+    on it, so a small cap keeps total throughput up.
+    """
+
+    def __init__(self, max_concurrent: int = 2):
+        self.max_concurrent = max_concurrent
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def handle(
+        self, request: TRequest, next_handler: Callable[[], Awaitable[TResponse]]
+    ) -> TResponse:
+        """Run the request once a slot for its key is free"""
+
+        limit_key = getattr(request, "concurrency_limit_key", None)
+        if not limit_key:
+            return await next_handler()
+
+        semaphore = self._semaphores.get(limit_key)
+        if semaphore is None:
+            semaphore = self._semaphores[limit_key] = asyncio.Semaphore(self.max_concurrent)
+
+        async with semaphore:
+            return await next_handler()
+
 
 class OutboxBehavior(IPipelineBehavior):
     """Enterprise transactional outbox behavior using pure CQRS"""
 
-    def __init__(self, mediator=None):
+    def __init__(self, mediator=None, saver=None):
         # Avoid circular import - mediator will be set when needed
         self._mediator = mediator
+        # Optional direct SaveEventsToOutboxHandler - skips mediator dispatch
+        self._saver = saver
 
     def set_mediator(self, mediator):
         """Set mediator reference (avoid circular dependency)"""
@@ -358,13 +504,25 @@ class OutboxBehavior(IPipelineBehavior):
             )
             return response
 
-        if not self._mediator:
+        if self._saver is None and not self._mediator:
             logger.error("OutboxBehavior: No mediator configured, cannot save events to outbox")
             return response
 
         try:
+            if self._saver is not None:
+                # Direct handler call - outbox saves are internal infrastructure
+                # messages and don't need routing or the pipeline chain
+                from ..messaging.outbox_cqrs import SaveEventsToOutboxCommand
+
+                await self._saver.handle(
+                    SaveEventsToOutboxCommand(
+                        events=list(domain_events),
+                        correlation_id=correlation_id,
+                        db_session=db_session,
+                    )
+                )
             # Save all domain events to outbox using CQRS
-            if len(domain_events) == 1:
+            elif len(domain_events) == 1:
                 # Single event
                 from ..messaging.outbox_cqrs import SaveEventToOutboxCommand
 
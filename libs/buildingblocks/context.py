@@ -2,7 +2,7 @@
 Request context infrastructure for pipeline behaviors and cross-cutting concerns
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Any
 from uuid import UUID, uuid4
 
@@ -35,6 +35,11 @@ class RequestContext:
     auto_commit: bool = True
 
 
+# Field names resolved once so per-request copies don't walk a fresh instance
+_CONTEXT_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(RequestContext))
+_MISSING = object()
+
+
 def with_context(request: Any, context: RequestContext) -> Any:
     """
     Attach RequestContext to a request object for pipeline behaviors to use
@@ -47,8 +52,8 @@ def with_context(request: Any, context: RequestContext) -> Any:
         The request object with context attached
     """
     # Attach all context attributes to the request
-    for attr_name, attr_value in context.__dict__.items():
-        setattr(request, attr_name, attr_value)
+    for attr_name in _CONTEXT_FIELDS:
+        setattr(request, attr_name, getattr(context, attr_name))
 
     return request
 
@@ -63,14 +68,14 @@ def get_context_from_request(request: Any) -> RequestContext:
     Returns:
         RequestContext extracted from the request
     """
-    context = RequestContext()
-
-    # Extract context attributes from request if they exist
-    for attr_name in context.__dict__.keys():
-        if hasattr(request, attr_name):
-            setattr(context, attr_name, getattr(request, attr_name))
-
-    return context
+    # Extract context attributes from request if they exist and build in one pass
+    values = {}
+    for attr_name in _CONTEXT_FIELDS:
+        value = getattr(request, attr_name, _MISSING)
+        if value is not _MISSING:
+            values[attr_name] = value
+
+    return RequestContext(**values)
 
 
 class ContextBuilder:
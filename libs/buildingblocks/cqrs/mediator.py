@@ -3,7 +3,10 @@ Enterprise Mediator Pattern Implementation for CQRS
 """
 
 import asyncio
+import inspect
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any, TypeVar
 
 from ..behaviors import IPipelineBehavior
@@ -58,26 +61,46 @@ class EnterpriseMediator(IMediator):
         self._command_with_response_handlers: dict[type, Any] = {}
         self._query_handlers: dict[type, Any] = {}
         self._pipeline_behaviors: list[IPipelineBehavior] = []
+        # Per request type: handler already wrapped in the behavior chain (see _compile).
+        # An entry is dropped when its handler is re-registered, all when behaviors change.
+        self._compiled_commands: dict[type, Callable[[Any], Awaitable[Any]]] = {}
+        self._compiled_commands_with_response: dict[type, Callable[[Any], Awaitable[Any]]] = {}
+        self._compiled_queries: dict[type, Callable[[Any], Awaitable[Any]]] = {}
 
     def register_command_handler(
         self, command_type: type[ICommand], handler: ICommandHandler
     ) -> None:
         """Register a command handler"""
         self._command_handlers[command_type] = handler
+        self._compiled_commands.pop(command_type, None)
 
     def register_command_with_response_handler(
         self, command_type: type[ICommandWithResponse], handler: ICommandHandlerWithResponse
     ) -> None:
         """Register a command handler that returns a response"""
         self._command_with_response_handlers[command_type] = handler
+        self._compiled_commands_with_response.pop(command_type, None)
 
     def register_query_handler(self, query_type: type[IQuery], handler: IQueryHandler) -> None:
         """Register a query handler"""
         self._query_handlers[query_type] = handler
+        self._compiled_queries.pop(query_type, None)
 
     def add_pipeline_behavior(self, behavior: IPipelineBehavior) -> None:
         """Add a pipeline behavior to the request processing pipeline"""
         self._pipeline_behaviors.append(behavior)
+        self._clear_compiled()
+
+    def clear_pipeline_behaviors(self) -> None:
+        """Remove every pipeline behavior (handlers stay registered)"""
+        self._pipeline_behaviors.clear()
+        self._clear_compiled()
+
+    def _clear_compiled(self) -> None:
+        """Drop compiled pipelines so the next send rebuilds them from current behaviors"""
+        self._compiled_commands.clear()
+        self._compiled_commands_with_response.clear()
+        self._compiled_queries.clear()
 
     async def _ensure_awaitable(self, result: Any) -> Any:
         """Ensure result is awaitable - if not, wrap it"""
@@ -88,17 +111,13 @@ class EnterpriseMediator(IMediator):
     async def send_command(self, command: ICommand) -> None:
         """Send a command with pipeline behaviors"""
         command_type = type(command)
-
-        if command_type not in self._command_handlers:
-            raise HandlerNotFoundException(command_type)
-
-        handler = self._command_handlers[command_type]
+        run = self._compiled_commands.get(command_type) or self._compile(
+            command_type, self._command_handlers, self._compiled_commands
+        )
 
         # Execute through pipeline behaviors
         try:
-            await self._execute_pipeline(
-                command, lambda: self._ensure_awaitable(handler.handle(command))
-            )
+            await run(command)
         except Exception as e:
             if not isinstance(e, HandlerNotFoundException):
                 raise PipelineExecutionException(
@@ -114,17 +133,15 @@ class EnterpriseMediator(IMediator):
     ) -> TResponse:
         """Send a command that returns a response with pipeline behaviors"""
         command_type = type(command)
-
-        if command_type not in self._command_with_response_handlers:
-            raise HandlerNotFoundException(command_type)
-
-        handler = self._command_with_response_handlers[command_type]
+        run = self._compiled_commands_with_response.get(command_type) or self._compile(
+            command_type,
+            self._command_with_response_handlers,
+            self._compiled_commands_with_response,
+        )
 
         # Execute through pipeline behaviors
         try:
-            return await self._execute_pipeline(
-                command, lambda: self._ensure_awaitable(handler.handle(command))
-            )
+            return await run(command)
         except Exception as e:
             if not isinstance(e, HandlerNotFoundException):
                 raise PipelineExecutionException(
@@ -138,17 +155,13 @@ class EnterpriseMediator(IMediator):
     async def send_query(self, query: IQuery[TResponse]) -> TResponse:
         """Send a query with pipeline behaviors"""
         query_type = type(query)
-
-        if query_type not in self._query_handlers:
-            raise HandlerNotFoundException(query_type)
-
-        handler = self._query_handlers[query_type]
+        run = self._compiled_queries.get(query_type) or self._compile(
+            query_type, self._query_handlers, self._compiled_queries
+        )
 
         # Execute through pipeline behaviors
         try:
-            return await self._execute_pipeline(
-                query, lambda: self._ensure_awaitable(handler.handle(query))
-            )
+            return await run(query)
         except Exception as e:
             if not isinstance(e, HandlerNotFoundException):
                 raise PipelineExecutionException(
@@ -156,26 +169,43 @@ class EnterpriseMediator(IMediator):
                 ) from e
             raise
 
-    async def _execute_pipeline(self, request: Any, final_handler) -> Any:
-        """Execute request through pipeline behaviors"""
-        if not self._pipeline_behaviors:
-            return await final_handler()
-
-        # Build the pipeline chain
-        current_handler = final_handler
-
-        # Wrap each behavior around the handler (reverse order)
-        for behavior in reversed(self._pipeline_behaviors):
-            # Capture the current handler in closure
-            next_handler = current_handler
-
-            async def create_handler(beh=behavior, nh=next_handler):
-                return await beh.handle(request, nh)
-
-            current_handler = create_handler
-
-        # Execute the pipeline
-        return await current_handler()
+    def _compile(
+        self,
+        request_type: type,
+        handlers: dict[type, Any],
+        compiled: dict[type, Callable[[Any], Awaitable[Any]]],
+    ) -> Callable[[Any], Awaitable[Any]]:
+        """
+        Build (once per request type) the callable that runs a request through the pipeline
+
+        The handler's sync/async check and the behavior order are resolved here, so sending
+        a request only chains partials - no per-request wrapper coroutines.
+        """
+        if request_type not in handlers:
+            raise HandlerNotFoundException(request_type)
+
+        handle = handlers[request_type].handle
+        if inspect.iscoroutinefunction(handle):
+            final_handler = handle
+        else:
+
+            def final_handler(request):
+                return self._ensure_awaitable(handle(request))
+
+        behaviors = tuple(reversed(self._pipeline_behaviors))
+        if not behaviors:
+            run = final_handler
+        else:
+
+            def run(request):
+                # Wrap each behavior around the handler (reverse order)
+                next_handler = partial(final_handler, request)
+                for behavior in behaviors:
+                    next_handler = partial(behavior.handle, request, next_handler)
+                return next_handler()
+
+        compiled[request_type] = run
+        return run
 
 
 # Legacy Mediator for backward compatibility
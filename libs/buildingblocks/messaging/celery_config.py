@@ -54,6 +54,14 @@ class CeleryConfig:
     task_soft_time_limit = 300  # 5 minutes
     task_time_limit = 600  # 10 minutes
 
+    # Periodic tasks
+    beat_schedule = {
+        "refresh-usage-monthly": {
+            "task": "billing.refresh_usage_monthly",
+            "schedule": 3600.0,  # Hourly
+        },
+    }
+
 
 # Apply configuration
 celery_app.config_from_object(CeleryConfig)
@@ -103,6 +111,25 @@ def deduct_credits(command_data: str, command_type: str = None):
         raise
 
 
+@celery_app.task(name="billing.refresh_usage_monthly")
+def refresh_usage_monthly():
+    """Refresh the monthly usage rollup read by dashboards and overage computation"""
+    from database import SessionLocal
+    from models.pricing import UsageMonthly
+
+    db_session = SessionLocal()
+    try:
+        UsageMonthly.refresh(db_session)
+        db_session.commit()
+        return {"status": "success"}
+    except Exception as e:
+        db_session.rollback()
+        print(f"Error refreshing usage rollup: {e}")
+        raise
+    finally:
+        db_session.close()
+
+
 # Initialize message bus on startup
 def initialize_messaging():
     """Initialize the message bus with event/command handlers"""
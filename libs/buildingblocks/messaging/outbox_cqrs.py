@@ -38,6 +38,14 @@ class MarkEventAsPublishedCommand(ICommand):
     db_session: Any = None  # Will be injected by pipeline
 
 
+@dataclass
+class MarkEventsAsPublishedCommand(ICommand):
+    """Command to mark a batch of events as published"""
+
+    event_ids: list[uuid.UUID]
+    db_session: Any = None  # Will be injected by pipeline
+
+
 @dataclass
 class MarkEventAsFailedCommand(ICommand):
     """Command to mark an event as failed"""
@@ -138,6 +146,17 @@ class MarkEventAsPublishedHandler(ICommandHandler[MarkEventAsPublishedCommand]):
         # Note: Transaction will be committed by TransactionBehavior
 
 
+class MarkEventsAsPublishedHandler(ICommandHandler[MarkEventsAsPublishedCommand]):
+    """Handler for marking a batch of events as published in one UPDATE"""
+
+    async def handle(self, command: MarkEventsAsPublishedCommand) -> None:
+        if not command.db_session:
+            raise ValueError("Database session is required")
+
+        EventOutbox.mark_many_as_published(command.db_session, command.event_ids)
+        # Note: Caller commits - run in a dedicated transaction (relaxed durability)
+
+
 class MarkEventAsFailedHandler(ICommandHandler[MarkEventAsFailedCommand]):
     """Handler for marking event as failed"""
 
@@ -161,9 +180,9 @@ class CleanupPublishedEventsHandler(ICommandHandler[CleanupPublishedEventsComman
         if not command.db_session:
             raise ValueError("Database session is required")
 
-        from datetime import datetime, timedelta
+        from datetime import UTC, datetime, timedelta
 
-        cutoff_date = datetime.utcnow() - timedelta(days=command.older_than_days)
+        cutoff_date = datetime.now(UTC) - timedelta(days=command.older_than_days)
 
         command.db_session.query(EventOutbox).filter(
             EventOutbox.published_at.isnot(None), EventOutbox.published_at < cutoff_date
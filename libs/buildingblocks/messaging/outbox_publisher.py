@@ -14,7 +14,7 @@ from building_blocks.messaging.outbox_cqrs import (
     CleanupPublishedEventsCommand,
     GetUnpublishedEventsQuery,
     MarkEventAsFailedCommand,
-    MarkEventAsPublishedCommand,
+    MarkEventsAsPublishedCommand,
 )
 from database import SessionLocal
 from models.messaging.event_outbox import EventOutbox
@@ -98,9 +98,19 @@ class OutboxEventPublisher:
 
                 logger.debug(f"Processing {len(unpublished_events)} outbox events")
 
-                # Process each event
+                # Process each event, collecting successful publishes
+                published_ids = []
                 for outbox_event in unpublished_events:
-                    await self._publish_single_event(outbox_event, db_session)
+                    if await self._publish_single_event(outbox_event, db_session):
+                        published_ids.append(outbox_event.id)
+
+                # Failure bookkeeping is committed with normal durability first
+                db_session.commit()
+
+                # Then mark the whole batch as published in one round-trip
+                if published_ids:
+                    await self._mark_many_as_published(published_ids, db_session)
+                    db_session.commit()
 
             finally:
                 db_session.close()
@@ -108,8 +118,8 @@ class OutboxEventPublisher:
         except Exception as e:
             logger.error(f"Error processing outbox events: {e}")
 
-    async def _publish_single_event(self, outbox_event: EventOutbox, db_session) -> None:
-        """Publish a single event from the outbox"""
+    async def _publish_single_event(self, outbox_event: EventOutbox, db_session) -> bool:
+        """Publish a single event from the outbox, returning True on success"""
         try:
             # Reconstruct the original event
             event = self._reconstruct_event(outbox_event)
@@ -117,7 +127,7 @@ class OutboxEventPublisher:
                 await self._mark_as_failed(
                     outbox_event.id, f"Unknown event type: {outbox_event.event_type}", db_session
                 )
-                return
+                return False
 
             # Get message bus and publish event
             message_bus = get_message_bus()
@@ -129,10 +139,8 @@ class OutboxEventPublisher:
                 # Assume it's an event if we can't determine
                 await message_bus.publish_event(event)
 
-            # Mark as published using CQRS command
-            await self._mark_as_published(outbox_event.id, db_session)
-
             logger.debug(f"Published event {outbox_event.event_type} " f"(id: {outbox_event.id})")
+            return True
 
         except Exception as e:
             logger.error(
@@ -142,6 +150,7 @@ class OutboxEventPublisher:
 
             # Mark as failed using CQRS command
             await self._mark_as_failed(outbox_event.id, str(e), db_session)
+            return False
 
     def _reconstruct_event(self, outbox_event: EventOutbox) -> Any:
         """Reconstruct event from outbox record"""
@@ -158,13 +167,13 @@ class OutboxEventPublisher:
             logger.error(f"Failed to reconstruct event {outbox_event.event_type}: {e}")
             return None
 
-    async def _mark_as_published(self, event_id: str, db_session) -> None:
-        """Mark event as published using CQRS"""
+    async def _mark_many_as_published(self, event_ids: list, db_session) -> None:
+        """Mark a batch of events as published using CQRS"""
         try:
-            command = MarkEventAsPublishedCommand(event_id=event_id, db_session=db_session)
+            command = MarkEventsAsPublishedCommand(event_ids=event_ids, db_session=db_session)
             await self.mediator.send_command(command)
         except Exception as e:
-            logger.error(f"Failed to mark event {event_id} as published: {e}")
+            logger.error(f"Failed to mark {len(event_ids)} events as published: {e}")
 
     async def _mark_as_failed(self, event_id: str, error_message: str, db_session) -> None:
         """Mark event as failed using CQRS"""
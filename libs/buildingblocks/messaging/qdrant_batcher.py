@@ -0,0 +1,89 @@
+"""
+Batched Qdrant upserts
+Coalesces single-point upserts from concurrent handlers into one upsert call per collection
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class QdrantBatcher:
+    """
+    In-process coalescer for Qdrant point upserts
+
+    Points are flushed per collection when max_batch_size points are waiting or max_wait
+    seconds after the first point of a batch arrived, whichever comes first. add() returns
+    once the batch holding the point has been written (or raises if the upsert failed).
+    """
+
+    def __init__(self, client, max_batch_size: int = 32, max_wait: float = 0.05):
+        self.client = client
+        # AsyncQdrantClient is awaited directly; the sync QdrantClient runs in a worker thread
+        self._client_is_async = inspect.iscoroutinefunction(client.upsert)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: dict[str, list[tuple[Any, asyncio.Future]]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._writes: set[asyncio.Task] = set()
+
+    async def add(self, collection_name: str, point) -> None:
+        """Queue a point for upsert and wait until its batch is written"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(collection_name, [])
+        batch.append((point, future))
+
+        if len(batch) >= self.max_batch_size:
+            self._start_write(collection_name)
+        elif collection_name not in self._timers:
+            self._timers[collection_name] = loop.call_later(
+                self.max_wait, self._start_write, collection_name
+            )
+
+        await future
+
+    async def flush(self) -> None:
+        """Write every pending batch now and wait for in-flight writes"""
+        for collection_name in list(self._pending):
+            self._start_write(collection_name)
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def _start_write(self, collection_name: str) -> None:
+        timer = self._timers.pop(collection_name, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(collection_name, None)
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._write(collection_name, batch))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write(self, collection_name: str, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        # Last write wins when the same point id was queued twice in one batch
+        points = list({point.id: point for point, _ in batch}.values())
+        try:
+            if self._client_is_async:
+                await self.client.upsert(collection_name=collection_name, points=points)
+            else:
+                await asyncio.to_thread(
+                    self.client.upsert, collection_name=collection_name, points=points
+                )
+        except Exception as e:
+            logger.error(f"Failed to upsert {len(points)} points into {collection_name}: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"Upserted {len(points)} points into {collection_name}")
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
@@ -0,0 +1,117 @@
+"""
+Buffered UsageLog writer
+Accumulates usage log rows in-process and writes them with multi-row INSERTs
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+from models.pricing import UsageLog
+from sqlalchemy import insert
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop() so the flush task finishes its current batch and exits
+_STOP = object()
+
+
+class UsageLogBuffer:
+    """
+    Background writer that batches UsageLog inserts
+
+    Rows are flushed when max_batch_size rows are waiting or flush_interval seconds
+    after the first row of a batch arrived, whichever comes first.
+    """
+
+    def __init__(self, engine, max_batch_size: int = 500, flush_interval: float = 0.05):
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._insert = insert(UsageLog.__table__)
+
+    def add(self, **row: Any) -> None:
+        """Queue a usage log row (column name -> value) for the next batch"""
+        # Stamp at enqueue time so created_at reflects the usage, not the flush
+        row.setdefault("created_at", datetime.now(UTC))
+        self._queue.put_nowait(row)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flush task"""
+        if self.running:
+            logger.warning("UsageLogBuffer is already running")
+            return
+
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Started UsageLogBuffer (batch {self.max_batch_size}, every {self.flush_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background task and flush any rows still queued"""
+        if self._task is not None:
+            self._queue.put_nowait(_STOP)
+            await self._task
+            self._task = None
+
+        await self.flush()
+        logger.info("UsageLogBuffer stopped")
+
+    async def flush(self) -> None:
+        """Write every queued row now"""
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                row = self._queue.get_nowait()
+                if row is not _STOP:
+                    batch.append(row)
+            if batch:
+                await self._write(batch)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await self._queue.get()
+            if row is _STOP:
+                return
+
+            batch = [row]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._write(batch)
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        """Insert a batch in one round-trip per column set (executemany -> multi-row VALUES)"""
+        # executemany binds the first row's columns for every row, so rows that set other
+        # columns (e.g. an explicit public_id) go in their own INSERT
+        groups: dict[frozenset, list[dict[str, Any]]] = {}
+        for row in batch:
+            groups.setdefault(frozenset(row), []).append(row)
+
+        try:
+            async with self.engine.begin() as conn:
+                for rows in groups.values():
+                    await conn.execute(self._insert, rows)
+            logger.debug(f"Wrote {len(batch)} usage log rows")
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} usage log rows: {e}")
@@ -4,11 +4,13 @@ Refresh token request DTO
 
 import uuid
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class RefreshTokenRequestDto(BaseModel):
     """DTO for refresh token requests"""
 
+    model_config = ConfigDict(frozen=True, str_max_length=4096)
+
     user_id: uuid.UUID
     refresh_token: str
@@ -2,12 +2,14 @@
 Token response DTO for authentication
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class TokenResponseDto(BaseModel):
     """DTO for authentication token responses"""
 
+    model_config = ConfigDict(frozen=True)
+
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
@@ -2,11 +2,13 @@
 User DTO for authentication requests
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class UserDto(BaseModel):
     """DTO for user authentication requests"""
 
+    model_config = ConfigDict(frozen=True, str_max_length=4096)
+
     username: str
     password: str
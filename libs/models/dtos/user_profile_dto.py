@@ -11,7 +11,7 @@ from pydantic import BaseModel, ConfigDict
 class UserProfileDto(BaseModel):
     """DTO for user profile responses (no sensitive data)"""
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
     user_id: uuid.UUID
     username: str
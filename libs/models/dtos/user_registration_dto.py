@@ -2,12 +2,14 @@
 User registration DTO
 """
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class UserRegistrationDto(BaseModel):
     """DTO for user registration"""
 
+    model_config = ConfigDict(frozen=True, str_max_length=4096)
+
     username: str
     password: str
     email_address: EmailStr
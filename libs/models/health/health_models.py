@@ -2,12 +2,14 @@
 Health domain models - centralized in models folder
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class GetHealthResponse(BaseModel):
     """Response model for health check"""
 
+    model_config = ConfigDict(frozen=True)
+
     status: str
     gpu_available: bool
     gpu_name: str
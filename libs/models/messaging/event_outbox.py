@@ -2,13 +2,13 @@
 Event Outbox model for transactional outbox pattern
 """
 
-import json
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any
 
+import orjson
 from models.user import UUID, Base
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, text, update
 from sqlalchemy.sql import func
 
 
@@ -23,12 +23,30 @@ class EventOutbox(Base):
     id = Column(UUID, primary_key=True, default=uuid.uuid4)
     event_type = Column(String(255), nullable=False)
     event_data = Column(Text, nullable=False)  # JSON-serialized event
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
-    published_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=True)
     retry_count = Column(Integer, default=0, nullable=False)
     error_message = Column(Text, nullable=True)
     correlation_id = Column(UUID, nullable=True)
 
+    __table_args__ = (
+        # Partial indexes keep the poller's working set to pending rows only,
+        # no matter how many published rows accumulate before cleanup
+        Index(
+            "idx_event_outbox_pending",
+            "created_at",
+            postgresql_where=text("published_at IS NULL"),
+            sqlite_where=text("published_at IS NULL"),
+        ),
+        Index(
+            "idx_event_outbox_failed_pending",
+            "retry_count",
+            "created_at",
+            postgresql_where=text("published_at IS NULL AND error_message IS NOT NULL"),
+            sqlite_where=text("published_at IS NULL AND error_message IS NOT NULL"),
+        ),
+    )
+
     def __repr__(self) -> str:
         status = "published" if self.published_at else "pending"
         return f"<EventOutbox(id={self.id}, type={self.event_type}, status={status})>"
@@ -41,7 +59,7 @@ class EventOutbox(Base):
     @property
     def event_data_dict(self) -> dict[str, Any]:
         """Get event data as dictionary"""
-        return json.loads(self.event_data)
+        return orjson.loads(self.event_data)
 
     @classmethod
     def from_event(cls, event: Any, correlation_id: uuid.UUID | None = None) -> "EventOutbox":
@@ -55,19 +73,52 @@ class EventOutbox(Base):
         Returns:
             EventOutbox instance ready to save
         """
+        dump_json = getattr(event, "model_dump_json", None)
+        if dump_json is not None:
+            event_data = dump_json()
+        else:
+            # OPT_NON_STR_KEYS keeps accepting the int/UUID/enum keys json.dumps allowed
+            event_data = orjson.dumps(event.__dict__, option=orjson.OPT_NON_STR_KEYS).decode()
         return cls(
-            event_type=(getattr(event, "event_type", None) or type(event).__name__),
-            event_data=(
-                event.model_dump_json()
-                if hasattr(event, "model_dump_json")
-                else json.dumps(event.__dict__)
-            ),
+            event_type=getattr(event, "event_type", None) or type(event).__name__,
+            event_data=event_data,
             correlation_id=correlation_id,
         )
 
     def mark_as_published(self) -> None:
         """Mark event as successfully published"""
-        self.published_at = datetime.utcnow()
+        self.published_at = datetime.now(UTC)
+
+    @classmethod
+    def mark_many_as_published(cls, db_session: Any, event_ids: list[uuid.UUID]) -> int:
+        """
+        Mark a batch of events as published with a single UPDATE
+
+        On PostgreSQL the surrounding transaction commits asynchronously
+        (synchronous_commit = off). This is safe for the publish side: a lost
+        update only causes a re-publish, and consumers are idempotent on event id.
+        Use a dedicated transaction so durable writes aren't affected.
+
+        Args:
+            db_session: SQLAlchemy session (caller commits)
+            event_ids: IDs of successfully published events
+
+        Returns:
+            Number of rows updated
+        """
+        if not event_ids:
+            return 0
+
+        if db_session.get_bind().dialect.name == "postgresql":
+            db_session.execute(text("SET LOCAL synchronous_commit = off"))
+
+        result = db_session.execute(
+            update(cls)
+            .where(cls.id.in_(event_ids))
+            .values(published_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     def mark_as_failed(self, error_message: str) -> None:
         """Mark event as failed and increment retry count"""
@@ -89,5 +140,5 @@ class EventOutbox(Base):
             return event_class.model_validate_json(self.event_data)
         else:
             # Regular class
-            data = json.loads(self.event_data)
+            data = orjson.loads(self.event_data)
             return event_class(**data)
@@ -4,24 +4,41 @@ Implements flexible pricing with credit purchases, dynamic pricing, overage hand
 """
 
 import uuid
-from enum import Enum
+from decimal import ROUND_HALF_EVEN, Decimal
+from enum import Enum, IntFlag
 
 from models.user import UUID, Base
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Boolean,
     Column,
     Date,
     DateTime,
+)
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy import (
     ForeignKey,
+    Identity,
     Index,
     Integer,
+    MetaData,
     Numeric,
+    SmallInteger,
     String,
+    Table,
     Text,
+    event,
+    select,
+    text,
+    update,
 )
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 
 
 class WorkspaceStatus(str, Enum):
@@ -53,6 +70,34 @@ class CollaboratorRole(str, Enum):
     VIEWER = "viewer"
 
 
+class Permissions(IntFlag):
+    """Workspace permission bits stored in WorkspaceCollaborator.permissions_mask"""
+
+    NONE = 0
+    READ = 1
+    WRITE = 2
+    ADMIN = 4
+    BILLING = 8
+    INVITE = 16
+    DELETE = 32
+
+
+ROLE_PERMISSIONS = {
+    CollaboratorRole.OWNER: Permissions.READ
+    | Permissions.WRITE
+    | Permissions.ADMIN
+    | Permissions.BILLING
+    | Permissions.INVITE
+    | Permissions.DELETE,
+    CollaboratorRole.ADMIN: Permissions.READ
+    | Permissions.WRITE
+    | Permissions.ADMIN
+    | Permissions.INVITE,
+    CollaboratorRole.EDITOR: Permissions.READ | Permissions.WRITE,
+    CollaboratorRole.VIEWER: Permissions.READ,
+}
+
+
 class BillingPeriod(str, Enum):
     MONTHLY = "monthly"
     ANNUAL = "annual"
@@ -87,6 +132,79 @@ class OverageStatus(str, Enum):
     FAILED = "failed"
 
 
+# Column defaults, bound once as plain values
+_BILLING_MONTHLY = BillingPeriod.MONTHLY.value
+_WORKSPACE_ACTIVE = WorkspaceStatus.ACTIVE.value
+_ROLE_EDITOR = CollaboratorRole.EDITOR
+_PURCHASE_ONE_TIME = PurchaseType.ONE_TIME.value
+_PROJECT_ACTIVE = ProjectStatus.ACTIVE.value
+_PROCESSING_PENDING = ProcessingStatus.PENDING.value
+_OVERAGE_PENDING = OverageStatus.PENDING.value
+
+
+class MoneyType(TypeDecorator):
+    """Monetary amount stored as BIGINT ten-thousandths of a currency unit, exposed as Decimal"""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if isinstance(value, float):
+            value = Decimal(str(value))
+        return int(Decimal(value).scaleb(4).to_integral_value(ROUND_HALF_EVEN))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return Decimal(value).scaleb(-4)
+
+    @property
+    def python_type(self):
+        return Decimal
+
+
+class SmallIntEnumType(TypeDecorator):
+    """
+    Enum stored as a SMALLINT code (its position in the enum definition)
+    Only ever append members to enums stored this way - reordering changes stored meaning.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls: type[Enum]):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._codes = {member: code for code, member in enumerate(enum_cls)}
+        self._members = tuple(enum_cls)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        return self._codes[self.enum_cls(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return self._members[value]
+
+    @property
+    def python_type(self):
+        return self.enum_cls
+
+
+# Leave 20% of each heap page free so updates of counter columns can stay HOT
+# (no index maintenance) on tables whose rows are rewritten on every request
+_HOT_UPDATE_TABLE_OPTIONS = {"postgresql_with": {"fillfactor": "80"}}
+
+
+def _enum_column_type(enum_cls: type[Enum], name: str) -> SAEnum:
+    """Native ENUM on PostgreSQL (4 bytes per row), VARCHAR elsewhere; stores member values"""
+    return SAEnum(enum_cls, name=name, values_callable=lambda members: [m.value for m in members])
+
+
 class PricingTier(Base):
     __tablename__ = "pricing_tiers"
 
@@ -101,9 +219,11 @@ class PricingTier(Base):
 
     # Relationships
     credit_allocations = relationship(
-        "TierCreditAllocation", back_populates="tier", cascade="all, delete-orphan"
+        "TierCreditAllocation", back_populates="tier", cascade="all, delete-orphan", lazy="selectin"
+    )
+    tier_features = relationship(
+        "TierFeature", back_populates="tier", cascade="all, delete-orphan", lazy="selectin"
     )
-    tier_features = relationship("TierFeature", back_populates="tier", cascade="all, delete-orphan")
     workspaces = relationship("Workspace", back_populates="tier")
 
 
@@ -114,7 +234,7 @@ class TierCreditAllocation(Base):
     billing_period = Column(String(20), primary_key=True)  # 'monthly', 'annual'
     base_credits = Column(Integer, nullable=False)
     bonus_credits = Column(Integer, default=0)  # Promotional/loyalty bonus
-    price = Column(Numeric(10, 2), nullable=False)
+    price = Column(MoneyType(), nullable=False)
     rollover_enabled = Column(Boolean, default=False)
     max_rollover_credits = Column(Integer)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -151,7 +271,7 @@ class Workspace(Base):
     description = Column(Text)
     owner_id = Column(UUID(), nullable=False, index=True)
     tier_id = Column(UUID(), ForeignKey("pricing_tiers.tier_id"), nullable=False, index=True)
-    billing_period = Column(String(20), default=BillingPeriod.MONTHLY.value, nullable=False)
+    billing_period = Column(String(20), default=_BILLING_MONTHLY, nullable=False)
 
     storage_limit_gb = Column(Integer, default=10, nullable=False)
     max_collaborators = Column(Integer, default=1, nullable=False)
@@ -159,20 +279,29 @@ class Workspace(Base):
     # Overage settings
     allow_overage = Column(Boolean, default=False, nullable=False)
     overage_limit_credits = Column(Integer, default=0, nullable=False)
-    overage_rate_per_credit = Column(Numeric(10, 4), default=0.05)
+    overage_rate_per_credit = Column(MoneyType(), default=Decimal("0.05"))
     current_overage_balance = Column(Integer, default=0, nullable=False)
 
+    # Running sum of CreditTransaction.credits_delta, maintained on ORM insert (see below)
+    current_balance_credits = Column(Integer, default=0, nullable=False)
+
     stripe_subscription_id = Column(String(255), unique=True)
     stripe_customer_id = Column(String(255))
     next_billing_date = Column(Date)
-    status = Column(String(20), default=WorkspaceStatus.ACTIVE.value, nullable=False, index=True)
+    status = Column(
+        _enum_column_type(WorkspaceStatus, "workspace_status"),
+        default=_WORKSPACE_ACTIVE,
+        nullable=False,
+        index=True,
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    tier = relationship("PricingTier", back_populates="workspaces")
+    # Request-hot relationships load eagerly: one JOIN for the tier, one IN() per collection
+    tier = relationship("PricingTier", back_populates="workspaces", lazy="joined")
     credits = relationship(
-        "WorkspaceCredit", back_populates="workspace", cascade="all, delete-orphan"
+        "WorkspaceCredit", back_populates="workspace", cascade="all, delete-orphan", lazy="selectin"
     )
     credit_transactions = relationship(
         "CreditTransaction", back_populates="workspace", cascade="all, delete-orphan"
@@ -188,7 +317,7 @@ class Workspace(Base):
     )
     usage_logs = relationship("UsageLog", back_populates="workspace")
     quotas = relationship(
-        "WorkspaceQuota", back_populates="workspace", cascade="all, delete-orphan"
+        "WorkspaceQuota", back_populates="workspace", cascade="all, delete-orphan", lazy="selectin"
     )
     overage_charges = relationship(
         "OverageCharge", back_populates="workspace", cascade="all, delete-orphan"
@@ -197,21 +326,53 @@ class Workspace(Base):
         "WorkspacePromotion", back_populates="workspace", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index(
+            "idx_workspaces_owner_active",
+            "owner_id",
+            postgresql_where=text("status = 'active'"),
+        ),
+        _HOT_UPDATE_TABLE_OPTIONS,
+    )
+
+
+def _default_permissions_mask(context) -> int:
+    """Default a collaborator's mask from its role when none is given"""
+    role = context.get_current_parameters().get("role")
+    if role is None:
+        return 0
+    return int(ROLE_PERMISSIONS.get(CollaboratorRole(role), Permissions.NONE))
+
 
 class WorkspaceCollaborator(Base):
     __tablename__ = "workspace_collaborators"
 
     workspace_id = Column(UUID(), ForeignKey("workspaces.workspace_id"), primary_key=True)
     user_id = Column(UUID(), primary_key=True, index=True)
-    role = Column(String(50), default=CollaboratorRole.EDITOR.value, nullable=False)
+    role = Column(SmallIntEnumType(CollaboratorRole), default=_ROLE_EDITOR, nullable=False)
     invited_by = Column(UUID())
     invited_at = Column(DateTime(timezone=True), server_default=func.now())
     accepted_at = Column(DateTime(timezone=True))
-    permissions = Column(JSONB)
+    permissions_mask = Column(BigInteger, nullable=False, default=_default_permissions_mask)
+    permissions = Column(JSONB)  # Legacy/audit only; checks use permissions_mask
 
     # Relationships
     workspace = relationship("Workspace", back_populates="collaborators")
 
+    def has_permissions(self, required: Permissions) -> bool:
+        """True if every bit of required is granted"""
+        return (self.permissions_mask & required) == required
+
+    __table_args__ = (
+        Index("idx_ws_collaborators_ws_mask", "workspace_id", "permissions_mask"),
+        Index(
+            "idx_ws_collaborators_permissions_gin",
+            "permissions",
+            postgresql_using="gin",
+            postgresql_ops={"permissions": "jsonb_path_ops"},
+        ),
+    )
+
 
 class WorkspaceCredit(Base):
     __tablename__ = "workspace_credits"
@@ -229,26 +390,48 @@ class WorkspaceCredit(Base):
     # Relationships
     workspace = relationship("Workspace", back_populates="credits")
 
-    __table_args__ = (Index("idx_workspace_credits_workspace_id", "workspace_id"),)
+    # workspace_id lookups use the primary key prefix - no standalone index needed
+    __table_args__ = (
+        # Covering index - balance checks are answered by an index-only scan
+        Index(
+            "idx_ws_credits_ws_feature",
+            "workspace_id",
+            "feature_code",
+            postgresql_include=["current_credits", "used_this_month"],
+        ),
+        _HOT_UPDATE_TABLE_OPTIONS,
+    )
 
 
 class CreditTransaction(Base):
     __tablename__ = "credit_transactions"
 
-    transaction_id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    workspace_id = Column(UUID(), ForeignKey("workspaces.workspace_id"), nullable=False, index=True)
+    # Sequential key keeps inserts on the right-most B-tree leaf; public_id is the external id
+    transaction_id = Column(BigInteger, Identity(always=False), primary_key=True)
+    public_id = Column(UUID(), server_default=text("gen_random_uuid()"), nullable=False)
+    # Indexed through idx_credit_txn_workspace_created
+    workspace_id = Column(UUID(), ForeignKey("workspaces.workspace_id"), nullable=False)
     feature_code = Column(String(50))
 
-    transaction_type = Column(String(30), nullable=False)
+    transaction_type = Column(
+        _enum_column_type(TransactionType, "credit_transaction_type"), nullable=False
+    )
     credits_delta = Column(Integer, nullable=False)  # Positive = added, negative = consumed
     balance_after = Column(Integer, nullable=False)
 
-    reference_id = Column(UUID())  # Links to usage_log_id, purchase_id, etc.
+    reference_id = Column(UUID())  # Links to usage log public_id, purchase_id, etc.
     reference_type = Column(String(30))  # 'usage_log', 'purchase', 'billing_cycle', etc.
 
     description = Column(Text)
     transaction_metadata = Column(JSONB)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Partition key - part of the primary key so it can be enforced across partitions
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        primary_key=True,
+        nullable=False,
+        index=True,
+    )
 
     # Relationships
     workspace = relationship("Workspace", back_populates="credit_transactions")
@@ -256,20 +439,42 @@ class CreditTransaction(Base):
     __table_args__ = (
         Index("idx_credit_txn_workspace_created", "workspace_id", "created_at"),
         Index("idx_credit_txn_reference", "reference_id", "reference_type"),
+        # Unique indexes on a partitioned table must include the partition key
+        Index("idx_credit_txn_public_id", "public_id", "created_at", unique=True),
+        # Covering index for per-feature transaction history
+        Index(
+            "idx_credit_txn_ws_feature_created",
+            "workspace_id",
+            "feature_code",
+            "created_at",
+            postgresql_include=["credits_delta", "balance_after"],
+        ),
+        # jsonb_path_ops GIN - serves @> containment filters at about half the jsonb_ops size
+        Index(
+            "idx_credit_txn_metadata_gin",
+            "transaction_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"transaction_metadata": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
 
 class CreditPurchase(Base):
     __tablename__ = "credit_purchases"
 
-    purchase_id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    purchase_id = Column(UUID(), primary_key=True, server_default=text("gen_random_uuid()"))
     workspace_id = Column(UUID(), ForeignKey("workspaces.workspace_id"), nullable=False, index=True)
     credits_purchased = Column(Integer, nullable=False)
-    price_paid = Column(Numeric(10, 2), nullable=False)
+    price_paid = Column(MoneyType(), nullable=False)
     stripe_payment_id = Column(String(255))
     expires_at = Column(Date)  # Optional: credits expire after 90 days
     credits_remaining = Column(Integer, nullable=False)
-    purchase_type = Column(String(20), default=PurchaseType.ONE_TIME.value, nullable=False)
+    purchase_type = Column(
+        _enum_column_type(PurchaseType, "credit_purchase_type"),
+        default=_PURCHASE_ONE_TIME,
+        nullable=False,
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -283,12 +488,12 @@ class WorkspaceProject(Base):
     workspace_id = Column(UUID(), ForeignKey("workspaces.workspace_id"), nullable=False, index=True)
     project_name = Column(String(255), nullable=False)
     description = Column(Text)
-    status = Column(String(20), default=ProjectStatus.ACTIVE.value, nullable=False, index=True)
+    status = Column(String(20), default=_PROJECT_ACTIVE, nullable=False, index=True)
     created_by = Column(UUID(), nullable=False, index=True)
     video_url = Column(String(500))
     thumbnail_url = Column(String(500))
     duration_seconds = Column(Integer)
-    processing_status = Column(String(20), default=ProcessingStatus.PENDING.value, nullable=False)
+    processing_status = Column(String(20), default=_PROCESSING_PENDING, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -300,7 +505,9 @@ class WorkspaceProject(Base):
 class UsageLog(Base):
     __tablename__ = "usage_logs"
 
-    log_id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    # Sequential key keeps inserts on the right-most B-tree leaf; public_id is the external id
+    log_id = Column(BigInteger, Identity(always=False), primary_key=True)
+    public_id = Column(UUID(), server_default=text("gen_random_uuid()"), nullable=False)
     workspace_id = Column(UUID(), ForeignKey("workspaces.workspace_id"), nullable=False)
     project_id = Column(UUID(), ForeignKey("workspace_projects.project_id"))
     user_id = Column(UUID(), nullable=False)
@@ -310,7 +517,14 @@ class UsageLog(Base):
     input_size_bytes = Column(Integer)
     output_size_bytes = Column(Integer)
     request_metadata = Column(JSONB)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Partition key - part of the primary key so it can be enforced across partitions
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        primary_key=True,
+        nullable=False,
+        index=True,
+    )
 
     # Relationships
     workspace = relationship("Workspace", back_populates="usage_logs")
@@ -320,7 +534,115 @@ class UsageLog(Base):
         Index("idx_usage_logs_workspace_feature", "workspace_id", "feature_code"),
         Index("idx_usage_logs_project_id", "project_id"),
         Index("idx_usage_logs_user_created", "user_id", "created_at"),
+        # Unique indexes on a partitioned table must include the partition key
+        Index("idx_usage_logs_public_id", "public_id", "created_at", unique=True),
+        Index(
+            "idx_usage_logs_metadata_gin",
+            "request_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"request_metadata": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+@event.listens_for(CreditTransaction, "after_insert")
+def _apply_credit_transaction_to_balance(mapper, connection, target):
+    """
+    Keep Workspace.current_balance_credits in step within the inserting transaction
+
+    Only ORM unit-of-work inserts fire this; after bulk or Core inserts into
+    credit_transactions, run backfill_workspace_credit_balances().
+    """
+    workspaces = Workspace.__table__
+    balance = connection.execute(
+        update(workspaces)
+        .where(workspaces.c.workspace_id == target.workspace_id)
+        .values(current_balance_credits=workspaces.c.current_balance_credits + target.credits_delta)
+        .returning(workspaces.c.current_balance_credits)
+    ).scalar_one_or_none()
+
+    # A Workspace already loaded in the session would otherwise keep its stale balance
+    session = object_session(target)
+    if session is not None and balance is not None:
+        workspace = session.identity_map.get(identity_key(Workspace, target.workspace_id))
+        if workspace is not None:
+            set_committed_value(workspace, "current_balance_credits", balance)
+
+
+def backfill_workspace_credit_balances(connection) -> None:
+    """
+    Recompute every Workspace.current_balance_credits from its credit transactions
+
+    Run once when the column is added, and after bulk/Core loads of credit_transactions.
+    """
+    workspaces = Workspace.__table__
+    transactions = CreditTransaction.__table__
+    total = (
+        select(func.coalesce(func.sum(transactions.c.credits_delta), 0))
+        .where(transactions.c.workspace_id == workspaces.c.workspace_id)
+        .scalar_subquery()
     )
+    connection.execute(update(workspaces).values(current_balance_credits=total))
+
+
+# Monthly partitions are managed outside the models (pg_partman or a scheduled job);
+# the DEFAULT partition catches rows outside them so inserts never fail for a missing month.
+for _partitioned in (CreditTransaction.__table__, UsageLog.__table__):
+    event.listen(
+        _partitioned,
+        "after_create",
+        DDL(
+            "CREATE TABLE IF NOT EXISTS %(table)s_default PARTITION OF %(table)s DEFAULT"
+        ).execute_if(dialect="postgresql"),
+    )
+
+
+# Monthly usage rollup for dashboards and overage computation.
+# The unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+event.listen(
+    UsageLog.__table__,
+    "after_create",
+    DDL(
+        "CREATE MATERIALIZED VIEW IF NOT EXISTS mv_usage_monthly AS "
+        "SELECT workspace_id, feature_code, date_trunc('month', created_at) AS month, "
+        "SUM(credits_consumed) AS credits, COUNT(*) AS calls "
+        "FROM usage_logs GROUP BY 1, 2, 3"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    UsageLog.__table__,
+    "after_create",
+    DDL(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_usage_monthly_key "
+        "ON mv_usage_monthly (workspace_id, feature_code, month)"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    UsageLog.__table__,
+    "before_drop",
+    DDL("DROP MATERIALIZED VIEW IF EXISTS mv_usage_monthly").execute_if(dialect="postgresql"),
+)
+
+
+class UsageMonthly(Base):
+    """Read-only mapping of the mv_usage_monthly materialized view"""
+
+    # Own MetaData so Base.metadata.create_all() never tries to create the view as a table
+    __table__ = Table(
+        "mv_usage_monthly",
+        MetaData(),
+        Column("workspace_id", UUID(), primary_key=True),
+        Column("feature_code", String(50), primary_key=True),
+        Column("month", DateTime(timezone=True), primary_key=True),
+        Column("credits", BigInteger, nullable=False),
+        Column("calls", BigInteger, nullable=False),
+    )
+
+    @classmethod
+    def refresh(cls, db_session) -> None:
+        """Refresh the view without blocking concurrent readers"""
+        db_session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_usage_monthly"))
 
 
 class FeatureDefinition(Base):
@@ -344,8 +666,9 @@ class FeaturePricingRule(Base):
     __tablename__ = "feature_pricing_rules"
 
     rule_id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    # Indexed through idx_pricing_rules_feature_active
     feature_code = Column(
-        String(50), ForeignKey("feature_definitions.feature_code"), nullable=False, index=True
+        String(50), ForeignKey("feature_definitions.feature_code"), nullable=False
     )
     tier_id = Column(UUID(), ForeignKey("pricing_tiers.tier_id"))  # NULL = all tiers
     credits_per_use = Column(Integer, nullable=False)
@@ -368,6 +691,13 @@ class FeaturePricingRule(Base):
     __table_args__ = (
         Index("idx_pricing_rules_feature_active", "feature_code", "is_active"),
         Index("idx_pricing_rules_valid_dates", "valid_from", "valid_until"),
+        # Partial index - only active rules are looked up on the hot path
+        Index(
+            "idx_pricing_rules_active_feature",
+            "feature_code",
+            "valid_from",
+            postgresql_where=text("is_active"),
+        ),
     )
 
 
@@ -391,21 +721,27 @@ class WorkspaceQuota(Base):
     # Relationships
     workspace = relationship("Workspace", back_populates="quotas")
 
+    __table_args__ = (_HOT_UPDATE_TABLE_OPTIONS,)
+
 
 class OverageCharge(Base):
     __tablename__ = "overage_charges"
 
-    charge_id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    charge_id = Column(UUID(), primary_key=True, server_default=text("gen_random_uuid()"))
     workspace_id = Column(UUID(), ForeignKey("workspaces.workspace_id"), nullable=False, index=True)
     billing_period_start = Column(Date, nullable=False)
     billing_period_end = Column(Date, nullable=False)
 
     credits_used_in_overage = Column(Integer, nullable=False)
-    rate_per_credit = Column(Numeric(10, 4), nullable=False)
-    total_charge = Column(Numeric(10, 2), nullable=False)
+    rate_per_credit = Column(MoneyType(), nullable=False)
+    total_charge = Column(MoneyType(), nullable=False)
 
     stripe_invoice_id = Column(String(255))
-    status = Column(String(20), default=OverageStatus.PENDING.value, nullable=False)
+    status = Column(
+        _enum_column_type(OverageStatus, "overage_status"),
+        default=_OVERAGE_PENDING,
+        nullable=False,
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -416,7 +752,7 @@ class PromotionalCode(Base):
     __tablename__ = "promotional_codes"
 
     promo_code = Column(String(50), primary_key=True)
-    promo_type = Column(String(30), nullable=False)
+    promo_type = Column(_enum_column_type(PromoType, "promo_type"), nullable=False)
 
     credit_bonus = Column(Integer)
     discount_percentage = Column(Numeric(5, 2))
@@ -435,6 +771,16 @@ class PromotionalCode(Base):
         "WorkspacePromotion", back_populates="promo", cascade="all, delete-orphan"
     )
 
+    # Validity window is checked at query time - now() is not allowed in an index predicate
+    __table_args__ = (
+        Index(
+            "idx_promo_active_code",
+            "promo_code",
+            "valid_until",
+            postgresql_where=text("is_active"),
+        ),
+    )
+
 
 class WorkspacePromotion(Base):
     __tablename__ = "workspace_promotions"
@@ -0,0 +1,227 @@
+"""
+In-process TTL cache for pricing reference data
+Tiers, feature definitions and pricing rules change rarely (admin writes only), so
+request paths read them from memory instead of issuing SELECTs every time.
+"""
+
+import time
+import uuid
+import weakref
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from models.pricing import FeatureDefinition, FeaturePricingRule, PricingTier
+
+# Redis pub/sub channel other processes listen on to drop their cached pricing data
+INVALIDATION_CHANNEL = "pricing-cache:invalidate"
+
+# Inputs above this size are charged with the rule's input_size_multiplier
+LARGE_INPUT_BYTES = 10 * 1024 * 1024
+
+_MISSING = object()
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC (SQLite drops the offset of DateTime(timezone=True))"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def build_credit_calculator(rule: FeaturePricingRule) -> Callable[[int, int], int]:
+    """
+    Specialize a pricing rule into a straight-line (input_bytes, use_count) -> credits function
+
+    The rule's constants are bound once and branches the rule can never take are left out,
+    so metering calls do no attribute lookups or Decimal arithmetic.
+    """
+    credits_per_use = rule.credits_per_use
+    size_multiplier = float(rule.input_size_multiplier or 1)
+    bulk_threshold = rule.bulk_discount_threshold
+    bulk_rate = float(rule.bulk_discount_rate) if rule.bulk_discount_rate is not None else None
+    large_input_bytes = LARGE_INPUT_BYTES
+
+    scales_by_size = size_multiplier != 1
+    has_bulk_discount = bulk_threshold is not None and bulk_rate is not None
+
+    if scales_by_size and has_bulk_discount:
+
+        def compute(input_bytes: int, use_count: int) -> int:
+            credits = credits_per_use
+            if input_bytes > large_input_bytes:
+                credits = int(credits * size_multiplier)
+            if use_count > bulk_threshold:
+                credits = int(credits * bulk_rate)
+            return credits
+
+    elif scales_by_size:
+
+        def compute(input_bytes: int, use_count: int) -> int:
+            if input_bytes > large_input_bytes:
+                return int(credits_per_use * size_multiplier)
+            return credits_per_use
+
+    elif has_bulk_discount:
+
+        def compute(input_bytes: int, use_count: int) -> int:
+            if use_count > bulk_threshold:
+                return int(credits_per_use * bulk_rate)
+            return credits_per_use
+
+    else:
+
+        def compute(input_bytes: int, use_count: int) -> int:
+            return credits_per_use
+
+    return compute
+
+
+class TTLDict:
+    """Dict whose entries expire ttl_seconds after they were set"""
+
+    __slots__ = ("ttl_seconds", "_entries")
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[Any, tuple[float, Any]] = {}
+
+    def get(self, key: Any) -> Any:
+        """Return the cached value, or _MISSING if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return _MISSING
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class PricingCache:
+    """
+    Process-level cache of PricingTier, FeatureDefinition and FeaturePricingRule rows
+
+    Cached instances are expunged from the loading session - treat them as read-only.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self._tiers = TTLDict(ttl_seconds)
+        self._features = TTLDict(ttl_seconds)
+        self._rules = TTLDict(ttl_seconds)
+        # Keyed by the cached rule instance, so a reloaded rule gets a fresh calculator
+        self._calculators: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def get_tier(self, db_session, tier_id: uuid.UUID) -> PricingTier | None:
+        """Get a pricing tier (with its credit allocations and features) by id"""
+        tier = self._tiers.get(tier_id)
+        if tier is _MISSING:
+            tier = db_session.get(PricingTier, tier_id)
+            if tier is not None:
+                db_session.expunge(tier)
+            self._tiers.set(tier_id, tier)
+        return tier
+
+    def get_feature(self, db_session, feature_code: str) -> FeatureDefinition | None:
+        """Get a feature definition by code"""
+        feature = self._features.get(feature_code)
+        if feature is _MISSING:
+            feature = db_session.get(FeatureDefinition, feature_code)
+            if feature is not None:
+                db_session.expunge(feature)
+            self._features.set(feature_code, feature)
+        return feature
+
+    def get_pricing_rule(
+        self,
+        db_session,
+        feature_code: str,
+        tier_id: uuid.UUID | None,
+        now: datetime | None = None,
+    ) -> FeaturePricingRule | None:
+        """Get the highest-priority active rule for a feature and tier that is valid at now"""
+        key = (feature_code, tier_id)
+        rules = self._rules.get(key)
+        if rules is _MISSING:
+            rules = self._load_rules(db_session, feature_code, tier_id)
+            self._rules.set(key, rules)
+
+        now = _as_utc(now) if now is not None else datetime.now(UTC)
+        for rule in rules:
+            if _as_utc(rule.valid_from) <= now and (
+                rule.valid_until is None or _as_utc(rule.valid_until) > now
+            ):
+                return rule
+        return None
+
+    def get_credit_calculator(
+        self,
+        db_session,
+        feature_code: str,
+        tier_id: uuid.UUID | None,
+        now: datetime | None = None,
+    ) -> Callable[[int, int], int] | None:
+        """Get the specialized credit calculator for the rule in effect, or None if no rule"""
+        rule = self.get_pricing_rule(db_session, feature_code, tier_id, now)
+        if rule is None:
+            return None
+
+        compute = self._calculators.get(rule)
+        if compute is None:
+            compute = self._calculators[rule] = build_credit_calculator(rule)
+        return compute
+
+    def invalidate(self) -> None:
+        """Drop every cached entry (call after an admin write to pricing tables)"""
+        self._tiers.clear()
+        self._features.clear()
+        self._rules.clear()
+        self._calculators.clear()
+
+    async def publish_invalidation(self, redis_client) -> None:
+        """Invalidate locally and tell other processes to do the same"""
+        self.invalidate()
+        await redis_client.publish(INVALIDATION_CHANNEL, "invalidate")
+
+    async def listen_for_invalidations(self, redis_client) -> None:
+        """Invalidate whenever another process publishes a pricing change (runs until cancelled)"""
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    self.invalidate()
+        finally:
+            await pubsub.unsubscribe(INVALIDATION_CHANNEL)
+
+    @staticmethod
+    def _load_rules(db_session, feature_code: str, tier_id: uuid.UUID | None) -> tuple:
+        """Load candidate rules (tier-specific and all-tier), best first"""
+        tier_filter = FeaturePricingRule.tier_id.is_(None)
+        if tier_id is not None:
+            tier_filter = tier_filter | (FeaturePricingRule.tier_id == tier_id)
+
+        rules = (
+            db_session.query(FeaturePricingRule)
+            .filter(
+                FeaturePricingRule.feature_code == feature_code,
+                FeaturePricingRule.is_active.is_(True),
+                tier_filter,
+            )
+            .order_by(
+                FeaturePricingRule.priority.desc(),
+                FeaturePricingRule.tier_id.is_(None),
+            )
+            .all()
+        )
+        for rule in rules:
+            db_session.expunge(rule)
+        return tuple(rules)
+
+
+# Process-wide instance
+pricing_cache = PricingCache()
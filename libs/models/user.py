@@ -33,12 +33,20 @@ class UUID(TypeDecorator):
             return str(value)
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
+        if value is None or isinstance(value, uuid.UUID):
             return value
+        return uuid.UUID(value)
+
+    def result_processor(self, dialect, coltype):
+        # The native PostgreSQL UUID type already yields uuid.UUID, so use its processor
+        # (None on psycopg2) instead of wrapping every row
+        if dialect.name == "postgresql":
+            return self.load_dialect_impl(dialect).result_processor(dialect, coltype)
+        return super().result_processor(dialect, coltype)
+
+    @property
+    def python_type(self):
+        return uuid.UUID
 
 
 Base = declarative_base()
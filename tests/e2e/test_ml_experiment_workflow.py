@@ -18,14 +18,17 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "libs"))
 
+import asyncio
 import io
-import json
+import time
 from dataclasses import dataclass
 from uuid import uuid4
 
-import mlflow
 import pytest
 from buildingblocks.cqrs import ICommand, ICommandHandler, IQuery, IQueryHandler
+from buildingblocks.messaging.cache_codec import decode_cache_value, encode_cache_value
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
 
 
 # ============================================================================
@@ -93,6 +96,12 @@ class GetCachedResultsQuery(IQuery[dict | None]):
 # Handlers
 # ============================================================================
 
+# Objects up to this size are sent in a single PUT instead of 5 MiB multipart chunks
+UPLOAD_PART_SIZE = 64 * 1024 * 1024
+
+# Redis key prefix for this cache
+EXPERIMENT_RESULTS_KEY_PREFIX = "experiment:results:"
+
 
 class CreateMLExperimentHandler(ICommandHandler):
     """Handler for creating ML experiments"""
@@ -101,26 +110,36 @@ class CreateMLExperimentHandler(ICommandHandler):
         self.mlflow = mlflow_client
 
     async def handle(self, command: CreateMLExperimentCommand) -> None:
-        self.mlflow.create_experiment(command.experiment_name)
+        # MLflow has no async API, so tracking calls run in a worker thread
+        await asyncio.to_thread(self.mlflow.create_experiment, command.experiment_name)
 
 
 class LogTrainingRunHandler(ICommandHandler):
     """Handler for logging training runs"""
 
-    def __init__(self, mlflow_client):
+    def __init__(self, mlflow_client: MlflowClient):
         self.mlflow = mlflow_client
 
     async def handle(self, command: LogTrainingRunCommand) -> None:
-        with mlflow.start_run(
-            experiment_id=command.experiment_id, run_name=command.run_name
-        ):
-            # Log params
-            for key, value in command.params.items():
-                mlflow.log_param(key, value)
-
-            # Log metrics
-            for key, value in command.metrics.items():
-                mlflow.log_metric(key, value)
+        await asyncio.to_thread(self._log_run, command)
+
+    def _log_run(self, command: LogTrainingRunCommand) -> None:
+        # Explicit run ids instead of mlflow's active run, so runs can be logged concurrently
+        run = self.mlflow.create_run(command.experiment_id, run_name=command.run_name)
+        timestamp = int(time.time() * 1000)
+        try:
+            self.mlflow.log_batch(
+                run.info.run_id,
+                metrics=[
+                    Metric(key, value, timestamp, 0) for key, value in command.metrics.items()
+                ],
+                params=[Param(key, str(value)) for key, value in command.params.items()],
+            )
+        except Exception:
+            # create_run has no context manager - mark the run FAILED like start_run would
+            self.mlflow.set_terminated(run.info.run_id, status="FAILED")
+            raise
+        self.mlflow.set_terminated(run.info.run_id)
 
 
 class SaveModelArtifactHandler(ICommandHandler):
@@ -132,11 +151,14 @@ class SaveModelArtifactHandler(ICommandHandler):
     async def handle(self, command: SaveModelArtifactCommand) -> None:
         object_name = f"models/{command.model_id}/model.pkl"
         data_stream = io.BytesIO(command.model_data)
-        self.minio.put_object(
+        # The MinIO SDK is sync-only, so the upload runs in a worker thread
+        await asyncio.to_thread(
+            self.minio.put_object,
             bucket_name=command.bucket_name,
             object_name=object_name,
             data=data_stream,
             length=len(command.model_data),
+            part_size=UPLOAD_PART_SIZE,
             content_type="application/octet-stream",
         )
 
@@ -148,31 +170,34 @@ class CacheExperimentResultsHandler(ICommandHandler):
         self.redis = redis_client
 
     async def handle(self, command: CacheExperimentResultsCommand) -> None:
-        cache_key = f"experiment:results:{command.run_id}"
-        self.redis.setex(cache_key, 7200, json.dumps(command.results))  # 2 hour TTL
+        cache_key = EXPERIMENT_RESULTS_KEY_PREFIX + command.run_id
+        await self.redis.setex(cache_key, 7200, encode_cache_value(command.results))  # 2 hour TTL
 
 
 class GetBestRunHandler(IQueryHandler):
     """Handler for finding best run by metric"""
 
-    def __init__(self, mlflow_client):
+    def __init__(self, mlflow_client: MlflowClient):
         self.mlflow = mlflow_client
 
     async def handle(self, query: GetBestRunQuery) -> dict | None:
         order_by = f"metrics.{query.metric_name} {'DESC' if query.maximize else 'ASC'}"
-        runs = self.mlflow.search_runs(
-            experiment_ids=[query.experiment_id], order_by=[order_by], max_results=1
+        # MlflowClient returns Run entities - no pandas DataFrame to build and re-walk
+        runs = await asyncio.to_thread(
+            self.mlflow.search_runs,
+            experiment_ids=[query.experiment_id],
+            order_by=[order_by],
+            max_results=1,
         )
 
-        if runs.empty:
+        if not runs:
             return None
 
-        best_run = runs.iloc[0]
-        # Access DataFrame columns - params and metrics are stored with prefixes
+        best_run = runs[0]
         return {
-            "run_id": best_run["run_id"],
-            "params": {k.replace("params.", ""): best_run[k] for k in best_run.index if k.startswith("params.")},
-            "metrics": {k.replace("metrics.", ""): best_run[k] for k in best_run.index if k.startswith("metrics.")},
+            "run_id": best_run.info.run_id,
+            "params": dict(best_run.data.params),
+            "metrics": dict(best_run.data.metrics),
         }
 
 
@@ -183,9 +208,9 @@ class GetCachedResultsHandler(IQueryHandler):
         self.redis = redis_client
 
     async def handle(self, query: GetCachedResultsQuery) -> dict | None:
-        cache_key = f"experiment:results:{query.run_id}"
-        cached = self.redis.get(cache_key)
-        return json.loads(cached) if cached else None
+        cache_key = EXPERIMENT_RESULTS_KEY_PREFIX + query.run_id
+        cached = await self.redis.get(cache_key)
+        return decode_cache_value(cached) if cached else None
 
 
 # ============================================================================
@@ -196,7 +221,7 @@ class GetCachedResultsHandler(IQueryHandler):
 @pytest.mark.e2e
 @pytest.mark.asyncio
 async def test_complete_ml_experiment_workflow(
-    mlflow_clean, minio_clean, redis_clean, mediator
+    mlflow_clean, minio_clean, async_redis, mediator
 ):
     """
     Complete E2E workflow: Create experiment → Log run → Save model → Cache results
@@ -208,17 +233,17 @@ async def test_complete_ml_experiment_workflow(
         CreateMLExperimentCommand, CreateMLExperimentHandler(mlflow_clean)
     )
     mediator.register_command_handler(
-        LogTrainingRunCommand, LogTrainingRunHandler(mlflow_clean)
+        LogTrainingRunCommand, LogTrainingRunHandler(MlflowClient())
     )
     mediator.register_command_handler(
         SaveModelArtifactCommand, SaveModelArtifactHandler(minio_clean)
     )
     mediator.register_command_handler(
-        CacheExperimentResultsCommand, CacheExperimentResultsHandler(redis_clean)
+        CacheExperimentResultsCommand, CacheExperimentResultsHandler(async_redis)
     )
-    mediator.register_query_handler(GetBestRunQuery, GetBestRunHandler(mlflow_clean))
+    mediator.register_query_handler(GetBestRunQuery, GetBestRunHandler(MlflowClient()))
     mediator.register_query_handler(
-        GetCachedResultsQuery, GetCachedResultsHandler(redis_clean)
+        GetCachedResultsQuery, GetCachedResultsHandler(async_redis)
     )
 
     # Step 1: Create ML experiment
@@ -302,9 +327,9 @@ async def test_compare_multiple_runs(mlflow_clean, mediator):
         CreateMLExperimentCommand, CreateMLExperimentHandler(mlflow_clean)
     )
     mediator.register_command_handler(
-        LogTrainingRunCommand, LogTrainingRunHandler(mlflow_clean)
+        LogTrainingRunCommand, LogTrainingRunHandler(MlflowClient())
     )
-    mediator.register_query_handler(GetBestRunQuery, GetBestRunHandler(mlflow_clean))
+    mediator.register_query_handler(GetBestRunQuery, GetBestRunHandler(MlflowClient()))
 
     # Create experiment
     experiment_name = f"test_comparison_{uuid4().hex[:8]}"
@@ -319,15 +344,20 @@ async def test_compare_multiple_runs(mlflow_clean, mediator):
         ("run_aggressive", {"lr": 0.1}, {"accuracy": 0.78, "loss": 0.22}),
     ]
 
-    for run_name, params, metrics in runs_data:
-        await mediator.send_command(
-            LogTrainingRunCommand(
-                experiment_id=experiment_id,
-                run_name=run_name,
-                params=params,
-                metrics=metrics,
+    # The runs are independent, so they are logged concurrently
+    await asyncio.gather(
+        *(
+            mediator.send_command(
+                LogTrainingRunCommand(
+                    experiment_id=experiment_id,
+                    run_name=run_name,
+                    params=params,
+                    metrics=metrics,
+                )
             )
+            for run_name, params, metrics in runs_data
         )
+    )
 
     print(f"✅ Logged {len(runs_data)} training runs")
 
@@ -371,15 +401,18 @@ async def test_model_versioning_workflow(minio_clean, mediator):
     model_id = str(uuid4())
 
     # Save 3 versions of the model
-    for version in [1, 2, 3]:
-        model_data = f"model version {version} weights".encode()
-        await mediator.send_command(
-            SaveModelArtifactCommand(
-                bucket_name=test_bucket,
-                model_id=f"{model_id}_v{version}",
-                model_data=model_data,
+    await asyncio.gather(
+        *(
+            mediator.send_command(
+                SaveModelArtifactCommand(
+                    bucket_name=test_bucket,
+                    model_id=f"{model_id}_v{version}",
+                    model_data=f"model version {version} weights".encode(),
+                )
             )
+            for version in [1, 2, 3]
         )
+    )
 
     print(f"✅ Saved 3 versions of model: {model_id}")
 
@@ -18,14 +18,27 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "libs"))
 
+import asyncio
 import io
-import json
 from dataclasses import dataclass, field
+from typing import ClassVar
 from uuid import uuid4
 
 import pytest
 from buildingblocks.cqrs import ICommand, ICommandHandler, IQuery, IQueryHandler
-from qdrant_client.models import Distance, PointStruct, VectorParams
+from buildingblocks.messaging.cache_codec import decode_cache_value, encode_cache_value
+from buildingblocks.messaging.qdrant_batcher import QdrantBatcher
+from qdrant_client.models import (
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PointStruct,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+)
+from tests.fixtures.docker_fixtures import create_test_collection
 
 
 # ============================================================================
@@ -53,6 +66,15 @@ class StoreVideoEmbeddingCommand(ICommand):
     metadata: dict
 
 
+@dataclass
+class StoreVideoEmbeddingsBatchCommand(ICommand):
+    """Store several video embeddings in one upsert"""
+
+    concurrency_limit_key: ClassVar[str] = "qdrant"
+    collection_name: str
+    videos: list[tuple[str, list[float], dict]]  # (video_id, embedding, metadata)
+
+
 @dataclass
 class CacheVideoMetadataCommand(ICommand):
     """Cache video metadata in Redis"""
@@ -70,11 +92,23 @@ class CacheVideoMetadataCommand(ICommand):
 class SearchSimilarVideosQuery(IQuery[list]):
     """Search for similar videos by embedding"""
 
+    concurrency_limit_key: ClassVar[str] = "qdrant"
     collection_name: str
     query_embedding: list[float]
     limit: int = 5
 
 
+@dataclass
+class SearchSimilarVideosBatchQuery(IQuery[list]):
+    """Search for similar videos by several embeddings at once"""
+
+    concurrency_limit_key: ClassVar[str] = "qdrant"
+    collection_name: str
+    query_embeddings: list[list[float]]
+    limit: int = 5
+    filter: Filter | None = None  # Applied to every probe
+
+
 @dataclass
 class GetVideoMetadataQuery(IQuery[dict | None]):
     """Get video metadata from cache"""
@@ -86,6 +120,18 @@ class GetVideoMetadataQuery(IQuery[dict | None]):
 # Handlers
 # ============================================================================
 
+# Objects up to this size are sent in a single PUT instead of 5 MiB multipart chunks
+UPLOAD_PART_SIZE = 64 * 1024 * 1024
+
+# Redis key prefix for this cache
+VIDEO_METADATA_KEY_PREFIX = "video:metadata:"
+
+# 128-dim collections keep an int8 copy of their vectors in RAM for search (a quarter of
+# float32); Qdrant rescores the top candidates against the original vectors
+EMBEDDING_QUANTIZATION = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+)
+
 
 class UploadVideoHandler(ICommandHandler):
     """Handler for uploading videos to MinIO"""
@@ -95,11 +141,14 @@ class UploadVideoHandler(ICommandHandler):
 
     async def handle(self, command: UploadVideoCommand) -> None:
         data_stream = io.BytesIO(command.video_data)
-        self.minio.put_object(
+        # The MinIO SDK is sync-only, so the upload runs in a worker thread
+        await asyncio.to_thread(
+            self.minio.put_object,
             bucket_name=command.bucket_name,
             object_name=command.object_name,
             data=data_stream,
             length=len(command.video_data),
+            part_size=UPLOAD_PART_SIZE,
             content_type="video/mp4",
         )
 
@@ -107,14 +156,31 @@ class UploadVideoHandler(ICommandHandler):
 class StoreVideoEmbeddingHandler(ICommandHandler):
     """Handler for storing video embeddings in Qdrant"""
 
-    def __init__(self, qdrant_client):
-        self.qdrant = qdrant_client
+    def __init__(self, batcher: QdrantBatcher):
+        self.batcher = batcher
 
     async def handle(self, command: StoreVideoEmbeddingCommand) -> None:
         point = PointStruct(
             id=command.video_id, vector=command.embedding, payload=command.metadata
         )
-        self.qdrant.upsert(collection_name=command.collection_name, points=[point])
+        await self.batcher.add(command.collection_name, point)
+
+
+class StoreVideoEmbeddingsBatchHandler(ICommandHandler):
+    """Handler for storing a batch of video embeddings in a single Qdrant upsert"""
+
+    def __init__(self, qdrant_client):
+        self.qdrant = qdrant_client
+
+    async def handle(self, command: StoreVideoEmbeddingsBatchCommand) -> None:
+        await self.qdrant.upsert(
+            collection_name=command.collection_name,
+            points=[
+                PointStruct(id=video_id, vector=embedding, payload=metadata)
+                for video_id, embedding, metadata in command.videos
+            ],
+            wait=True,
+        )
 
 
 class CacheVideoMetadataHandler(ICommandHandler):
@@ -124,8 +190,8 @@ class CacheVideoMetadataHandler(ICommandHandler):
         self.redis = redis_client
 
     async def handle(self, command: CacheVideoMetadataCommand) -> None:
-        cache_key = f"video:metadata:{command.video_id}"
-        self.redis.setex(cache_key, 3600, json.dumps(command.metadata))  # 1 hour TTL
+        cache_key = VIDEO_METADATA_KEY_PREFIX + command.video_id
+        await self.redis.setex(cache_key, 3600, encode_cache_value(command.metadata))  # 1 hour TTL
 
 
 class SearchSimilarVideosHandler(IQueryHandler):
@@ -135,11 +201,35 @@ class SearchSimilarVideosHandler(IQueryHandler):
         self.qdrant = qdrant_client
 
     async def handle(self, query: SearchSimilarVideosQuery) -> list:
-        results = self.qdrant.search(
+        response = await self.qdrant.query_points(
             collection_name=query.collection_name,
-            query_vector=query.query_embedding,
+            query=query.query_embedding,
             limit=query.limit,
         )
+        return response.points
+
+
+class SearchSimilarVideosBatchHandler(IQueryHandler):
+    """Handler for running several similarity searches in one Qdrant request"""
+
+    def __init__(self, qdrant_client):
+        self.qdrant = qdrant_client
+
+    # Probes per query_batch_points request - batch latency stops improving past ~16
+    max_batch_size = 16
+
+    async def handle(self, query: SearchSimilarVideosBatchQuery) -> list:
+        requests = [
+            QueryRequest(query=embedding, filter=query.filter, limit=query.limit, with_payload=True)
+            for embedding in query.query_embeddings
+        ]
+        results = []
+        for start in range(0, len(requests), self.max_batch_size):
+            responses = await self.qdrant.query_batch_points(
+                collection_name=query.collection_name,
+                requests=requests[start : start + self.max_batch_size],
+            )
+            results.extend(response.points for response in responses)
         return results
 
 
@@ -150,9 +240,9 @@ class GetVideoMetadataHandler(IQueryHandler):
         self.redis = redis_client
 
     async def handle(self, query: GetVideoMetadataQuery) -> dict | None:
-        cache_key = f"video:metadata:{query.video_id}"
-        cached = self.redis.get(cache_key)
-        return json.loads(cached) if cached else None
+        cache_key = VIDEO_METADATA_KEY_PREFIX + query.video_id
+        cached = await self.redis.get(cache_key)
+        return decode_cache_value(cached) if cached else None
 
 
 # ============================================================================
@@ -163,7 +253,7 @@ class GetVideoMetadataHandler(IQueryHandler):
 @pytest.mark.e2e
 @pytest.mark.asyncio
 async def test_complete_video_analysis_workflow(
-    minio_clean, qdrant_clean, redis_clean, mediator
+    minio_clean, minio_prefix, qdrant_clean, async_qdrant, async_redis, mediator
 ):
     """
     Complete E2E workflow: Upload video → Store embedding → Cache metadata → Search
@@ -172,31 +262,30 @@ async def test_complete_video_analysis_workflow(
     """
     # Setup: Create Qdrant collection
     collection_name = f"test_videos_{uuid4().hex[:8]}"
-    qdrant_clean.create_collection(
-        collection_name=collection_name,
-        vectors_config=VectorParams(size=128, distance=Distance.COSINE),
+    create_test_collection(
+        qdrant_clean, collection_name, 128, quantization_config=EMBEDDING_QUANTIZATION
     )
 
     # Register all handlers
     test_bucket = os.getenv("MINIO_TEST_BUCKET", "test-artifacts")
     mediator.register_command_handler(UploadVideoCommand, UploadVideoHandler(minio_clean))
     mediator.register_command_handler(
-        StoreVideoEmbeddingCommand, StoreVideoEmbeddingHandler(qdrant_clean)
+        StoreVideoEmbeddingCommand, StoreVideoEmbeddingHandler(QdrantBatcher(async_qdrant))
     )
     mediator.register_command_handler(
-        CacheVideoMetadataCommand, CacheVideoMetadataHandler(redis_clean)
+        CacheVideoMetadataCommand, CacheVideoMetadataHandler(async_redis)
     )
     mediator.register_query_handler(
-        SearchSimilarVideosQuery, SearchSimilarVideosHandler(qdrant_clean)
+        SearchSimilarVideosQuery, SearchSimilarVideosHandler(async_qdrant)
     )
     mediator.register_query_handler(
-        GetVideoMetadataQuery, GetVideoMetadataHandler(redis_clean)
+        GetVideoMetadataQuery, GetVideoMetadataHandler(async_redis)
     )
 
     # Step 1: Upload video to MinIO
     video_id = str(uuid4())
     video_data = b"fake video content for testing"
-    object_name = f"videos/{video_id}.mp4"
+    object_name = f"{minio_prefix}/videos/{video_id}.mp4"
 
     await mediator.send_command(
         UploadVideoCommand(
@@ -261,12 +350,12 @@ async def test_complete_video_analysis_workflow(
 
 @pytest.mark.e2e
 @pytest.mark.asyncio
-async def test_cache_miss_scenario(redis_clean, mediator):
+async def test_cache_miss_scenario(async_redis, mediator):
     """
     Test cache miss scenario - query for non-existent video metadata.
     """
     mediator.register_query_handler(
-        GetVideoMetadataQuery, GetVideoMetadataHandler(redis_clean)
+        GetVideoMetadataQuery, GetVideoMetadataHandler(async_redis)
     )
 
     nonexistent_video_id = str(uuid4())
@@ -280,7 +369,9 @@ async def test_cache_miss_scenario(redis_clean, mediator):
 
 @pytest.mark.e2e
 @pytest.mark.asyncio
-async def test_multiple_videos_search(minio_clean, qdrant_clean, mediator):
+async def test_multiple_videos_search(
+    minio_clean, minio_prefix, qdrant_clean, async_qdrant, mediator
+):
     """
     Test uploading multiple videos and searching across them.
     
@@ -288,66 +379,84 @@ async def test_multiple_videos_search(minio_clean, qdrant_clean, mediator):
     """
     # Setup: Create collection
     collection_name = f"test_multi_videos_{uuid4().hex[:8]}"
-    qdrant_clean.create_collection(
-        collection_name=collection_name,
-        vectors_config=VectorParams(size=4, distance=Distance.COSINE),
-    )
+    create_test_collection(qdrant_clean, collection_name, 4)
 
     # Register handlers
     test_bucket = os.getenv("MINIO_TEST_BUCKET", "test-artifacts")
     mediator.register_command_handler(UploadVideoCommand, UploadVideoHandler(minio_clean))
     mediator.register_command_handler(
-        StoreVideoEmbeddingCommand, StoreVideoEmbeddingHandler(qdrant_clean)
+        StoreVideoEmbeddingsBatchCommand, StoreVideoEmbeddingsBatchHandler(async_qdrant)
     )
     mediator.register_query_handler(
-        SearchSimilarVideosQuery, SearchSimilarVideosHandler(qdrant_clean)
+        SearchSimilarVideosBatchQuery, SearchSimilarVideosBatchHandler(async_qdrant)
     )
 
     # Upload and store 3 videos with different embeddings
     videos = [
-        ([1.0, 0.0, 0.0, 0.0], "action_movie.mp4"),
-        ([0.9, 0.1, 0.0, 0.0], "similar_action.mp4"),  # Similar to first
-        ([0.0, 0.0, 1.0, 0.0], "documentary.mp4"),  # Different
+        (str(uuid4()), [1.0, 0.0, 0.0, 0.0], "action_movie.mp4"),
+        (str(uuid4()), [0.9, 0.1, 0.0, 0.0], "similar_action.mp4"),  # Similar to first
+        (str(uuid4()), [0.0, 0.0, 1.0, 0.0], "documentary.mp4"),  # Different
     ]
 
-    video_ids = []
-    for embedding, filename in videos:
-        video_id = str(uuid4())
-        video_ids.append(video_id)
-
-        # Upload to MinIO
-        await mediator.send_command(
-            UploadVideoCommand(
-                video_id=video_id,
-                bucket_name=test_bucket,
-                object_name=f"videos/{filename}",
-                video_data=b"fake video data",
+    # Videos are independent - upload them concurrently
+    await asyncio.gather(
+        *(
+            mediator.send_command(
+                UploadVideoCommand(
+                    video_id=video_id,
+                    bucket_name=test_bucket,
+                    object_name=f"{minio_prefix}/videos/{filename}",
+                    video_data=b"fake video data",
+                )
             )
+            for video_id, _, filename in videos
         )
+    )
 
-        # Store embedding
-        await mediator.send_command(
-            StoreVideoEmbeddingCommand(
-                video_id=video_id,
-                collection_name=collection_name,
-                embedding=embedding,
-                metadata={"filename": filename},
-            )
+    # Store every embedding with one upsert
+    await mediator.send_command(
+        StoreVideoEmbeddingsBatchCommand(
+            collection_name=collection_name,
+            videos=[
+                (video_id, embedding, {"filename": filename})
+                for video_id, embedding, filename in videos
+            ],
         )
+    )
 
     print(f"✅ Uploaded and indexed {len(videos)} videos")
 
-    # Search for videos similar to first one
-    query_embedding = [1.0, 0.0, 0.0, 0.0]
-    results = await mediator.send_query(
-        SearchSimilarVideosQuery(
-            collection_name=collection_name, query_embedding=query_embedding, limit=2
+    # Search for videos similar to the first and to the last one in a single request
+    action_results, documentary_results = await mediator.send_query(
+        SearchSimilarVideosBatchQuery(
+            collection_name=collection_name,
+            query_embeddings=[[1.0, 0.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]],
+            limit=2,
         )
     )
 
     # Verify: Should find action movies, not documentary
-    assert len(results) >= 2
-    assert "action" in results[0].payload["filename"].lower()
-    assert "action" in results[1].payload["filename"].lower()
+    assert len(action_results) >= 2
+    assert "action" in action_results[0].payload["filename"].lower()
+    assert "action" in action_results[1].payload["filename"].lower()
+    assert documentary_results[0].payload["filename"] == "documentary.mp4"
 
     print(f"✅ Search found correct similar videos (action movies, not documentary)")
+
+    # The same probes restricted by one shared payload filter
+    documentary_only = Filter(
+        must=[FieldCondition(key="filename", match=MatchValue(value="documentary.mp4"))]
+    )
+    filtered_results = await mediator.send_query(
+        SearchSimilarVideosBatchQuery(
+            collection_name=collection_name,
+            query_embeddings=[[1.0, 0.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]],
+            filter=documentary_only,
+        )
+    )
+
+    assert [[r.payload["filename"] for r in results] for results in filtered_results] == [
+        ["documentary.mp4"],
+        ["documentary.mp4"],
+    ]
+    print(f"✅ Filtered batch search only returned the documentary")
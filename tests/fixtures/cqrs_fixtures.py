@@ -19,16 +19,22 @@ from typing import Generator
 
 import pytest
 from buildingblocks.behaviors import (
+    CircuitBreakerBehavior,
+    ConcurrencyLimitBehavior,
     LoggingBehavior,
     ValidationBehavior,
 )
 from buildingblocks.cqrs import EnterpriseMediator, IMediator
 
+# In-flight requests per concurrency_limit_key ("qdrant") - a single Qdrant worker
+# answers each request slower once more than a couple are queued on it
+QDRANT_MAX_INFLIGHT = int(os.getenv("QDRANT_MAX_INFLIGHT", "2"))
+
 
 @pytest.fixture(scope="function")
 def mediator() -> Generator[IMediator, None, None]:
     """
-    Function-scoped mediator fixture with validation and logging behaviors.
+    Function-scoped mediator fixture with validation, logging and concurrency-limit behaviors.
     Clean instance for each test.
     """
     mediator = EnterpriseMediator()
@@ -36,6 +42,7 @@ def mediator() -> Generator[IMediator, None, None]:
     # Add standard pipeline behaviors
     mediator.add_pipeline_behavior(ValidationBehavior())
     mediator.add_pipeline_behavior(LoggingBehavior(slow_threshold=1.0))
+    mediator.add_pipeline_behavior(ConcurrencyLimitBehavior(QDRANT_MAX_INFLIGHT))
 
     yield mediator
 
@@ -56,17 +63,12 @@ def mediator_full() -> Generator[IMediator, None, None]:
     Function-scoped mediator fixture with full enterprise behaviors.
     Includes validation, logging, retry, and circuit breaker.
     """
-    from buildingblocks.behaviors import (
-        CircuitBreakerBehavior,
-        LoggingBehavior,
-        ValidationBehavior,
-    )
-
     mediator = EnterpriseMediator()
 
     # Add enterprise pipeline behaviors
     mediator.add_pipeline_behavior(ValidationBehavior())
     mediator.add_pipeline_behavior(LoggingBehavior(slow_threshold=1.0))
+    mediator.add_pipeline_behavior(ConcurrencyLimitBehavior(QDRANT_MAX_INFLIGHT))
     mediator.add_pipeline_behavior(CircuitBreakerBehavior(failure_threshold=3))
 
     yield mediator
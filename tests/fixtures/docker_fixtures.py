@@ -17,18 +17,78 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "libs"))
 
 import asyncio
-from typing import Generator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Generator
+from uuid import uuid4
 
 import pytest
 import redis
+import urllib3
 from dotenv import load_dotenv
 from minio import Minio
-from qdrant_client import QdrantClient
+from minio.deleteobjects import DeleteObject
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import (
+    Distance,
+    Filter,
+    FilterSelector,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
+    QuantizationConfig,
+    VectorParams,
+)
+from redis.asyncio import ConnectionPool as AsyncConnectionPool
+from redis.asyncio import Redis as AsyncRedis
 
 # Load test environment
 env_path = project_root / ".env.test"
 load_dotenv(env_path)
 
+# Connections kept per client pool - handlers share one pooled client instead of dialing
+POOL_MAX_CONNECTIONS = 64
+
+# Test collections hold at most a few hundred points: two segments and a sparse HNSW graph
+# are plenty, and keep collection creation and indexing cheap
+TEST_COLLECTION_OPTIMIZERS = OptimizersConfigDiff(default_segment_number=2, memmap_threshold=10_000)
+TEST_COLLECTION_HNSW = HnswConfigDiff(m=8, ef_construct=64)
+
+# Vector size of the pooled collections reused by tests that only need an empty one
+QDRANT_POOL_VECTOR_SIZE = 4
+
+
+def create_test_collection(
+    client: QdrantClient,
+    collection_name: str,
+    vector_size: int,
+    distance: Distance = Distance.COSINE,
+    quantization_config: QuantizationConfig | None = None,
+) -> None:
+    """Create a Qdrant collection with optimizer/HNSW settings sized for test data"""
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=VectorParams(size=vector_size, distance=distance),
+        optimizers_config=TEST_COLLECTION_OPTIMIZERS,
+        hnsw_config=TEST_COLLECTION_HNSW,
+        quantization_config=quantization_config,
+    )
+
+
+def delete_qdrant_collections(client: QdrantClient, collection_names: list[str]) -> None:
+    """Delete collections in parallel - each delete is an independent round-trip"""
+    if not collection_names:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(collection_names))) as executor:
+        list(executor.map(client.delete_collection, collection_names))
+
+
+def empty_minio_bucket(client: Minio, bucket_name: str, prefix: str | None = None) -> None:
+    """Remove every object (under prefix) with batched DeleteObjects requests (1000 keys each)"""
+    objects = client.list_objects(bucket_name, prefix=prefix, recursive=True)
+    errors = client.remove_objects(bucket_name, (DeleteObject(o.object_name) for o in objects))
+    for error in errors:
+        print(f"⚠️ Failed to remove MinIO object {error.name}: {error.message}")
+
 
 @pytest.fixture(scope="session")
 def redis_client() -> Generator[redis.Redis, None, None]:
@@ -37,7 +97,7 @@ def redis_client() -> Generator[redis.Redis, None, None]:
     Connects to dev Redis instance but uses separate DB for tests.
     """
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/1")
-    client = redis.from_url(redis_url, decode_responses=True)
+    client = redis.from_url(redis_url, decode_responses=True, max_connections=POOL_MAX_CONNECTIONS)
 
     # Verify connection
     try:
@@ -46,6 +106,10 @@ def redis_client() -> Generator[redis.Redis, None, None]:
     except redis.ConnectionError as e:
         pytest.fail(f"❌ Redis connection failed: {e}\nEnsure Docker services are running!")
 
+    # Start from an empty test database (an interrupted run may have left keys behind);
+    # from here on each test leaves it empty on teardown
+    client.flushdb(asynchronous=True)
+
     yield client
 
     # Cleanup: Flush test database after session
@@ -61,24 +125,40 @@ def redis_clean(redis_client: redis.Redis) -> Generator[redis.Redis, None, None]
     """
     Function-scoped Redis fixture with automatic cleanup after each test.
     """
-    # Clear before test
-    redis_client.flushdb()
-
     yield redis_client
 
-    # Clear after test
-    redis_client.flushdb()
+    # Clear after test - ASYNC frees the keys in a background thread, like UNLINK,
+    # so Redis is not blocked while a large test dataset is released
+    redis_client.flushdb(asynchronous=True)
+
+
+@pytest.fixture(scope="function")
+async def async_redis(redis_clean: redis.Redis) -> AsyncGenerator[AsyncRedis, None]:
+    """
+    Function-scoped asyncio Redis client on the same (cleaned) test database as redis_clean.
+    Asyncio connections are bound to the event loop, so the pool lives as long as the test's loop.
+    Replies are raw bytes: cached values may be compressed (see buildingblocks cache_codec).
+    """
+    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/1")
+    pool = AsyncConnectionPool.from_url(redis_url, max_connections=POOL_MAX_CONNECTIONS)
+    client = AsyncRedis(connection_pool=pool)
+
+    yield client
+
+    await client.aclose()
+    await pool.aclose()
 
 
 @pytest.fixture(scope="session")
 def qdrant_client() -> Generator[QdrantClient, None, None]:
     """
-    Session-scoped Qdrant client fixture.
+    Session-scoped Qdrant client fixture (gRPC - protobuf instead of HTTP/JSON per call).
     """
     host = os.getenv("QDRANT_HOST", "localhost")
     port = int(os.getenv("QDRANT_PORT", "6333"))
+    grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 
-    client = QdrantClient(host=host, port=port)
+    client = QdrantClient(host=host, port=port, grpc_port=grpc_port, prefer_grpc=True)
 
     # Verify connection
     try:
@@ -92,14 +172,16 @@ def qdrant_client() -> Generator[QdrantClient, None, None]:
     # Cleanup: Delete test collections
     if os.getenv("TEST_CLEANUP_ENABLED", "true").lower() == "true":
         collections = client.get_collections()
-        for collection in collections.collections:
-            if collection.name.startswith("test_"):
-                client.delete_collection(collection.name)
-                print(f"🧹 Deleted Qdrant collection: {collection.name}")
+        test_collections = [c.name for c in collections.collections if c.name.startswith("test_")]
+        delete_qdrant_collections(client, test_collections)
+        for collection_name in test_collections:
+            print(f"🧹 Deleted Qdrant collection: {collection_name}")
 
 
 @pytest.fixture(scope="function")
-def qdrant_clean(qdrant_client: QdrantClient) -> Generator[QdrantClient, None, None]:
+def qdrant_clean(
+    qdrant_client: QdrantClient, qdrant_collection_pool: deque[str]
+) -> Generator[QdrantClient, None, None]:
     """
     Function-scoped Qdrant fixture with automatic collection cleanup.
     """
@@ -110,13 +192,66 @@ def qdrant_clean(qdrant_client: QdrantClient) -> Generator[QdrantClient, None, N
 
     # Cleanup: Delete collections created during test
     final_collections = {c.name for c in qdrant_client.get_collections().collections}
-    new_collections = final_collections - initial_collections
+    # Pooled collections created during the test are kept for reuse
+    new_collections = final_collections - initial_collections - set(qdrant_collection_pool)
 
+    delete_qdrant_collections(qdrant_client, list(new_collections))
     for collection_name in new_collections:
-        qdrant_client.delete_collection(collection_name)
         print(f"🧹 Cleaned up Qdrant collection: {collection_name}")
 
 
+@pytest.fixture(scope="session")
+def qdrant_collection_pool() -> deque[str]:
+    """
+    Session-scoped pool of idle empty Qdrant collections (QDRANT_POOL_VECTOR_SIZE-dim, cosine).
+
+    Starts empty and grows only when every pooled collection is in use, so sequential tests
+    share one collection; the session cleanup in qdrant_client removes them (test_ names).
+    """
+    return deque()
+
+
+@pytest.fixture(scope="function")
+def qdrant_pooled_collection(
+    qdrant_client: QdrantClient, qdrant_collection_pool: deque[str]
+) -> Generator[str, None, None]:
+    """
+    Function-scoped name of an empty pooled collection, emptied and returned after the test.
+
+    Tests that need a collection with their own name or settings stay on qdrant_clean.
+    """
+    if qdrant_collection_pool:
+        collection_name = qdrant_collection_pool.popleft()
+    else:
+        collection_name = f"test_pool_{uuid4().hex[:8]}"
+        create_test_collection(qdrant_client, collection_name, QDRANT_POOL_VECTOR_SIZE)
+
+    yield collection_name
+
+    # Delete the points but keep the collection for the next test
+    qdrant_client.delete(
+        collection_name=collection_name,
+        points_selector=FilterSelector(filter=Filter(must=[])),
+        wait=True,
+    )
+    qdrant_collection_pool.append(collection_name)
+
+
+@pytest.fixture(scope="function")
+async def async_qdrant(qdrant_clean: QdrantClient) -> AsyncGenerator[AsyncQdrantClient, None]:
+    """
+    Function-scoped gRPC AsyncQdrantClient; collections it creates are cleaned up by qdrant_clean.
+    """
+    host = os.getenv("QDRANT_HOST", "localhost")
+    port = int(os.getenv("QDRANT_PORT", "6333"))
+    grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+    client = AsyncQdrantClient(host=host, port=port, grpc_port=grpc_port, prefer_grpc=True)
+
+    yield client
+
+    await client.close()
+
+
 @pytest.fixture(scope="session")
 def minio_client() -> Generator[Minio, None, None]:
     """
@@ -127,7 +262,20 @@ def minio_client() -> Generator[Minio, None, None]:
     secret_key = os.getenv("MINIO_SECRET_KEY", "minioadmin123")
     secure = os.getenv("MINIO_SECURE", "false").lower() == "true"
 
-    client = Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure)
+    # Same settings as the SDK default client, with a larger keep-alive pool
+    http_client = urllib3.PoolManager(
+        maxsize=POOL_MAX_CONNECTIONS,
+        block=False,
+        timeout=urllib3.Timeout(connect=300, read=300),
+        retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
+    client = Minio(
+        endpoint,
+        access_key=access_key,
+        secret_key=secret_key,
+        secure=secure,
+        http_client=http_client,
+    )
 
     # Verify connection
     try:
@@ -141,6 +289,9 @@ def minio_client() -> Generator[Minio, None, None]:
     if not client.bucket_exists(test_bucket):
         client.make_bucket(test_bucket)
         print(f"📦 Created MinIO test bucket: {test_bucket}")
+    else:
+        # Leftovers from an interrupted run - swept once instead of before every test
+        empty_minio_bucket(client, test_bucket)
 
     yield client
 
@@ -148,33 +299,33 @@ def minio_client() -> Generator[Minio, None, None]:
     if os.getenv("TEST_CLEANUP_ENABLED", "true").lower() == "true":
         test_bucket = os.getenv("MINIO_TEST_BUCKET", "test-artifacts")
         if client.bucket_exists(test_bucket):
-            # Remove all objects in test bucket
-            objects = client.list_objects(test_bucket, recursive=True)
-            for obj in objects:
-                client.remove_object(test_bucket, obj.object_name)
+            empty_minio_bucket(client, test_bucket)
             print(f"🧹 Cleaned up MinIO test bucket: {test_bucket}")
 
 
 @pytest.fixture(scope="function")
-def minio_clean(minio_client: Minio) -> Generator[Minio, None, None]:
+def minio_prefix() -> str:
+    """
+    Per-test object key prefix - tests write their MinIO objects under it.
+    """
+    return f"t/{uuid4().hex[:8]}"
+
+
+@pytest.fixture(scope="function")
+def minio_clean(minio_client: Minio, minio_prefix: str) -> Generator[Minio, None, None]:
     """
     Function-scoped MinIO fixture with automatic object cleanup.
+
+    Only objects under the test's minio_prefix are removed, so cleanup cost follows the
+    test's own keys rather than the bucket size. Objects written elsewhere are removed by
+    the session-wide sweep in minio_client.
     """
     test_bucket = os.getenv("MINIO_TEST_BUCKET", "test-artifacts")
 
-    # Clear bucket before test
-    if minio_client.bucket_exists(test_bucket):
-        objects = minio_client.list_objects(test_bucket, recursive=True)
-        for obj in objects:
-            minio_client.remove_object(test_bucket, obj.object_name)
-
     yield minio_client
 
-    # Clear bucket after test
-    if minio_client.bucket_exists(test_bucket):
-        objects = minio_client.list_objects(test_bucket, recursive=True)
-        for obj in objects:
-            minio_client.remove_object(test_bucket, obj.object_name)
+    # Clear the test's objects after the test
+    empty_minio_bucket(minio_client, test_bucket, prefix=f"{minio_prefix}/")
 
 
 @pytest.fixture(scope="session")
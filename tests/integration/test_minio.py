@@ -13,12 +13,13 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "libs"))
 
+import asyncio
 import io
 from dataclasses import dataclass
-from uuid import uuid4
 
 import pytest
 from buildingblocks.cqrs import ICommand, ICommandHandler, IQuery, IQueryHandler
+from minio.error import S3Error
 
 
 # ============================================================================
@@ -50,7 +51,7 @@ class DeleteFileCommand(ICommand):
 
 
 @dataclass
-class DownloadFileQuery(IQuery[bytes]):
+class DownloadFileQuery(IQuery[bytearray]):
     """Download a file from MinIO bucket"""
 
     bucket_name: str
@@ -65,10 +66,21 @@ class ListFilesQuery(IQuery[list[str]]):
     prefix: str = ""
 
 
+@dataclass
+class ObjectExistsQuery(IQuery[bool]):
+    """Check whether an object exists in MinIO bucket"""
+
+    bucket_name: str
+    object_name: str
+
+
 # ============================================================================
 # Handlers
 # ============================================================================
 
+# Bytes per read while streaming a download
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class UploadFileHandler(ICommandHandler):
     """Handler for uploading files to MinIO"""
@@ -78,7 +90,9 @@ class UploadFileHandler(ICommandHandler):
 
     async def handle(self, command: UploadFileCommand) -> None:
         data_stream = io.BytesIO(command.data)
-        self.minio.put_object(
+        # The MinIO SDK is sync-only, so the upload runs in a worker thread
+        await asyncio.to_thread(
+            self.minio.put_object,
             bucket_name=command.bucket_name,
             object_name=command.object_name,
             data=data_stream,
@@ -105,14 +119,32 @@ class DownloadFileHandler(IQueryHandler):
     def __init__(self, minio_client):
         self.minio = minio_client
 
-    async def handle(self, query: DownloadFileQuery) -> bytes:
+    async def handle(self, query: DownloadFileQuery) -> bytearray:
+        return await asyncio.to_thread(self._download, query)
+
+    def _download(self, query: DownloadFileQuery) -> bytearray:
         response = self.minio.get_object(
             bucket_name=query.bucket_name, object_name=query.object_name
         )
-        data = response.read()
-        response.close()
-        response.release_conn()
-        return data
+        try:
+            # Stream into one buffer sized from Content-Length, so the object is held once
+            # instead of as read chunks plus their joined copy
+            length = int(response.headers.get("Content-Length", 0))
+            if not length:
+                return bytearray(response.read())
+
+            data = bytearray(length)
+            view = memoryview(data)
+            offset = 0
+            for chunk in response.stream(DOWNLOAD_CHUNK_SIZE):
+                view[offset : offset + len(chunk)] = chunk
+                offset += len(chunk)
+            if offset != length:
+                raise OSError(f"Expected {length} bytes of {query.object_name}, got {offset}")
+            return data
+        finally:
+            response.close()
+            response.release_conn()
 
 
 class ListFilesHandler(IQueryHandler):
@@ -128,6 +160,26 @@ class ListFilesHandler(IQueryHandler):
         return [obj.object_name for obj in objects]
 
 
+class ObjectExistsHandler(IQueryHandler):
+    """Handler for checking a single object with a HEAD request instead of a bucket listing"""
+
+    def __init__(self, minio_client):
+        self.minio = minio_client
+
+    async def handle(self, query: ObjectExistsQuery) -> bool:
+        try:
+            await asyncio.to_thread(
+                self.minio.stat_object,
+                bucket_name=query.bucket_name,
+                object_name=query.object_name,
+            )
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                return False
+            raise
+        return True
+
+
 # ============================================================================
 # Tests
 # ============================================================================
@@ -136,7 +188,7 @@ class ListFilesHandler(IQueryHandler):
 @pytest.mark.integration
 @pytest.mark.minio
 @pytest.mark.asyncio
-async def test_upload_and_download_file(minio_clean, mediator):
+async def test_upload_and_download_file(minio_clean, minio_prefix, mediator):
     """
     Test uploading and downloading a file to/from MinIO via CQRS.
     
@@ -151,7 +203,7 @@ async def test_upload_and_download_file(minio_clean, mediator):
 
     # Upload file
     test_bucket = os.getenv("MINIO_TEST_BUCKET", "test-artifacts")
-    object_name = f"test/{uuid4().hex[:8]}/test_file.txt"
+    object_name = f"{minio_prefix}/test_file.txt"
     test_data = b"Hello from MinIO integration test!"
 
     await mediator.send_command(
@@ -176,7 +228,7 @@ async def test_upload_and_download_file(minio_clean, mediator):
 @pytest.mark.integration
 @pytest.mark.minio
 @pytest.mark.asyncio
-async def test_list_files_in_bucket(minio_clean, mediator):
+async def test_list_files_in_bucket(minio_clean, minio_prefix, mediator):
     """
     Test listing files in a MinIO bucket via CQRS.
     """
@@ -186,18 +238,21 @@ async def test_list_files_in_bucket(minio_clean, mediator):
 
     # Upload multiple files
     test_bucket = os.getenv("MINIO_TEST_BUCKET", "test-artifacts")
-    test_prefix = f"test_list/{uuid4().hex[:8]}"
-
-    file_names = ["file1.txt", "file2.txt", "file3.txt"]
-    for file_name in file_names:
-        object_name = f"{test_prefix}/{file_name}"
-        await mediator.send_command(
-            UploadFileCommand(
-                bucket_name=test_bucket,
-                object_name=object_name,
-                data=b"test content",
+    test_prefix = f"{minio_prefix}/test_list"
+
+    file_names = frozenset({"file1.txt", "file2.txt", "file3.txt"})
+    await asyncio.gather(
+        *(
+            mediator.send_command(
+                UploadFileCommand(
+                    bucket_name=test_bucket,
+                    object_name=f"{test_prefix}/{file_name}",
+                    data=b"test content",
+                )
             )
+            for file_name in file_names
         )
+    )
 
     # List files
     files = await mediator.send_query(
@@ -206,8 +261,7 @@ async def test_list_files_in_bucket(minio_clean, mediator):
 
     # Verify all files are listed
     assert len(files) == 3
-    for file_name in file_names:
-        assert any(file_name in f for f in files)
+    assert file_names <= {f.rsplit("/", 1)[-1] for f in files}
 
     print(f"✅ Listed {len(files)} files from MinIO bucket with prefix: {test_prefix}")
 
@@ -215,18 +269,18 @@ async def test_list_files_in_bucket(minio_clean, mediator):
 @pytest.mark.integration
 @pytest.mark.minio
 @pytest.mark.asyncio
-async def test_delete_file(minio_clean, mediator):
+async def test_delete_file(minio_clean, minio_prefix, mediator):
     """
     Test deleting a file from MinIO via CQRS.
     """
     # Register handlers
     mediator.register_command_handler(UploadFileCommand, UploadFileHandler(minio_clean))
     mediator.register_command_handler(DeleteFileCommand, DeleteFileHandler(minio_clean))
-    mediator.register_query_handler(ListFilesQuery, ListFilesHandler(minio_clean))
+    mediator.register_query_handler(ObjectExistsQuery, ObjectExistsHandler(minio_clean))
 
     # Upload file
     test_bucket = os.getenv("MINIO_TEST_BUCKET", "test-artifacts")
-    object_name = f"test_delete/{uuid4().hex[:8]}/file_to_delete.txt"
+    object_name = f"{minio_prefix}/file_to_delete.txt"
 
     await mediator.send_command(
         UploadFileCommand(
@@ -235,10 +289,9 @@ async def test_delete_file(minio_clean, mediator):
     )
 
     # Verify file exists
-    files = await mediator.send_query(
-        ListFilesQuery(bucket_name=test_bucket, prefix="test_delete")
+    assert await mediator.send_query(
+        ObjectExistsQuery(bucket_name=test_bucket, object_name=object_name)
     )
-    assert any(object_name in f for f in files)
 
     # Delete file
     await mediator.send_command(
@@ -246,9 +299,8 @@ async def test_delete_file(minio_clean, mediator):
     )
 
     # Verify file is gone
-    files = await mediator.send_query(
-        ListFilesQuery(bucket_name=test_bucket, prefix="test_delete")
+    assert not await mediator.send_query(
+        ObjectExistsQuery(bucket_name=test_bucket, object_name=object_name)
     )
-    assert not any(object_name in f for f in files)
 
     print(f"✅ Deleted file from MinIO: {object_name}")
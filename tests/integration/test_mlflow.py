@@ -13,11 +13,14 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "libs"))
 
+import time
 from dataclasses import dataclass, field
 from uuid import uuid4
 
 import pytest
 from buildingblocks.cqrs import ICommand, ICommandHandler, IQuery, IQueryHandler
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
 
 
 # ============================================================================
@@ -82,7 +85,7 @@ class CreateExperimentHandler(ICommandHandler):
 class LogExperimentRunHandler(ICommandHandler):
     """Handler for logging MLflow runs"""
 
-    def __init__(self, mlflow_client):
+    def __init__(self, mlflow_client: MlflowClient):
         self.mlflow = mlflow_client
 
     async def handle(self, command: LogExperimentRunCommand) -> None:
@@ -91,21 +94,24 @@ class LogExperimentRunHandler(ICommandHandler):
         if not experiment:
             raise ValueError(f"Experiment not found: {command.experiment_name}")
 
-        # Start run
-        with self.mlflow.start_run(
-            experiment_id=experiment.experiment_id, run_name=command.run_name
-        ) as run:
-            # Log parameters
-            for key, value in command.params.items():
-                self.mlflow.log_param(key, value)
-
-            # Log metrics
-            for key, value in command.metrics.items():
-                self.mlflow.log_metric(key, value)
-
-            # Set tags
-            for key, value in command.tags.items():
-                self.mlflow.set_tag(key, value)
+        # Log params, metrics and tags in one request instead of one per value
+        run = self.mlflow.create_run(experiment.experiment_id, run_name=command.run_name)
+        timestamp = int(time.time() * 1000)
+        try:
+            self.mlflow.log_batch(
+                run.info.run_id,
+                metrics=[
+                    Metric(key, float(value), timestamp, 0)
+                    for key, value in command.metrics.items()
+                ],
+                params=[Param(key, str(value)) for key, value in command.params.items()],
+                tags=[RunTag(key, value) for key, value in command.tags.items()],
+            )
+        except Exception:
+            # create_run has no context manager - mark the run FAILED like start_run would
+            self.mlflow.set_terminated(run.info.run_id, status="FAILED")
+            raise
+        self.mlflow.set_terminated(run.info.run_id)
 
 
 class GetExperimentHandler(IQueryHandler):
@@ -196,7 +202,7 @@ async def test_log_experiment_run(mlflow_client, mediator):
         CreateExperimentCommand, CreateExperimentHandler(mlflow_client)
     )
     mediator.register_command_handler(
-        LogExperimentRunCommand, LogExperimentRunHandler(mlflow_client)
+        LogExperimentRunCommand, LogExperimentRunHandler(MlflowClient())
     )
     mediator.register_query_handler(SearchRunsQuery, SearchRunsHandler(mlflow_client))
 
@@ -13,12 +13,25 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "libs"))
 
+import asyncio
 from dataclasses import dataclass
 from uuid import uuid4
 
 import pytest
 from buildingblocks.cqrs import ICommand, ICommandHandler, IQuery, IQueryHandler
-from qdrant_client.models import Distance, PointStruct, VectorParams
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Distance,
+    HnswConfigDiff,
+    PointStruct,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
 
 
 # ============================================================================
@@ -33,6 +46,13 @@ class CreateCollectionCommand(ICommand):
     collection_name: str
     vector_size: int = 128
     distance: str = "Cosine"
+    # Opt-in for large collections; small ones gain nothing from these but build cost
+    quantization: str = "none"  # "none", "scalar" (int8, 4x smaller) or "binary" (32x)
+    on_disk: bool = False  # Keep original vectors on disk, quantized ones stay in RAM
+    # None keeps Qdrant's defaults (m=16, ef_construct=100); a denser graph (e.g. 24/128)
+    # gives better recall/QPS at 100K+ points for a slower index build
+    hnsw_m: int | None = None
+    hnsw_ef_construct: int | None = None
 
 
 @dataclass
@@ -45,6 +65,14 @@ class StoreVectorCommand(ICommand):
     payload: dict | None = None
 
 
+@dataclass
+class StoreVectorsBatchCommand(ICommand):
+    """Store several points in Qdrant collection"""
+
+    collection_name: str
+    points: list[PointStruct]
+
+
 @dataclass
 class DeleteCollectionCommand(ICommand):
     """Delete a collection from Qdrant"""
@@ -64,6 +92,10 @@ class SearchSimilarVectorsQuery(IQuery[list]):
     collection_name: str
     query_vector: list[float]
     limit: int = 5
+    ef_search: int | None = None  # HNSW candidate list size (None: server default)
+    # Quantized collections: fetch oversampling * limit candidates, re-rank on full vectors
+    rescore: bool = True
+    oversampling: float = 2.0
 
 
 # ============================================================================
@@ -71,6 +103,16 @@ class SearchSimilarVectorsQuery(IQuery[list]):
 # ============================================================================
 
 
+# Quantized copies of the vectors are what search scans - keep them in RAM
+QUANTIZATION_CONFIGS = {
+    "none": None,
+    "scalar": ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+    ),
+    "binary": BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True)),
+}
+
+
 class CreateCollectionHandler(ICommandHandler):
     """Handler for creating Qdrant collections"""
 
@@ -84,11 +126,15 @@ class CreateCollectionHandler(ICommandHandler):
             "Dot": Distance.DOT,
         }
 
-        self.qdrant.create_collection(
+        await self.qdrant.create_collection(
             collection_name=command.collection_name,
             vectors_config=VectorParams(
-                size=command.vector_size, distance=distance_map[command.distance]
+                size=command.vector_size,
+                distance=distance_map[command.distance],
+                on_disk=command.on_disk,
             ),
+            hnsw_config=HnswConfigDiff(m=command.hnsw_m, ef_construct=command.hnsw_ef_construct),
+            quantization_config=QUANTIZATION_CONFIGS[command.quantization],
         )
 
 
@@ -102,7 +148,28 @@ class StoreVectorHandler(ICommandHandler):
         point = PointStruct(
             id=command.vector_id, vector=command.vector, payload=command.payload or {}
         )
-        self.qdrant.upsert(collection_name=command.collection_name, points=[point])
+        await self.qdrant.upsert(collection_name=command.collection_name, points=[point])
+
+
+class StoreVectorsBatchHandler(ICommandHandler):
+    """Handler for storing many points with as few Qdrant upserts as possible"""
+
+    # Points per upsert request - larger batches are split and written concurrently
+    max_batch_size = 512
+
+    def __init__(self, qdrant_client):
+        self.qdrant = qdrant_client
+
+    async def handle(self, command: StoreVectorsBatchCommand) -> None:
+        await asyncio.gather(
+            *(
+                self.qdrant.upsert(
+                    collection_name=command.collection_name,
+                    points=command.points[start : start + self.max_batch_size],
+                )
+                for start in range(0, len(command.points), self.max_batch_size)
+            )
+        )
 
 
 class DeleteCollectionHandler(ICommandHandler):
@@ -112,7 +179,7 @@ class DeleteCollectionHandler(ICommandHandler):
         self.qdrant = qdrant_client
 
     async def handle(self, command: DeleteCollectionCommand) -> None:
-        self.qdrant.delete_collection(command.collection_name)
+        await self.qdrant.delete_collection(command.collection_name)
 
 
 class SearchSimilarVectorsHandler(IQueryHandler):
@@ -122,12 +189,18 @@ class SearchSimilarVectorsHandler(IQueryHandler):
         self.qdrant = qdrant_client
 
     async def handle(self, query: SearchSimilarVectorsQuery) -> list:
-        results = self.qdrant.search(
+        response = await self.qdrant.query_points(
             collection_name=query.collection_name,
-            query_vector=query.query_vector,
+            query=query.query_vector,
             limit=query.limit,
+            search_params=SearchParams(
+                hnsw_ef=query.ef_search,
+                quantization=QuantizationSearchParams(
+                    rescore=query.rescore, oversampling=query.oversampling
+                ),
+            ),
         )
-        return results
+        return response.points
 
 
 # ============================================================================
@@ -138,55 +211,61 @@ class SearchSimilarVectorsHandler(IQueryHandler):
 @pytest.mark.integration
 @pytest.mark.qdrant
 @pytest.mark.asyncio
-async def test_create_collection(qdrant_clean, mediator):
+async def test_create_collection(qdrant_clean, async_qdrant, mediator):
     """
     Test creating a vector collection in Qdrant via CQRS.
     """
     mediator.register_command_handler(
-        CreateCollectionCommand, CreateCollectionHandler(qdrant_clean)
+        CreateCollectionCommand, CreateCollectionHandler(async_qdrant)
     )
 
     collection_name = f"test_collection_{uuid4().hex[:8]}"
     await mediator.send_command(
-        CreateCollectionCommand(collection_name=collection_name, vector_size=128)
+        CreateCollectionCommand(
+            collection_name=collection_name,
+            vector_size=128,
+            quantization="scalar",
+            hnsw_m=24,
+            hnsw_ef_construct=128,
+        )
     )
 
     # Verify collection exists
     collections = qdrant_clean.get_collections()
-    collection_names = [c.name for c in collections.collections]
+    collection_names = {c.name for c in collections.collections}
     assert collection_name in collection_names
 
+    # Opted-in index settings were applied
+    collection = qdrant_clean.get_collection(collection_name)
+    assert isinstance(collection.config.quantization_config, ScalarQuantization)
+    assert collection.config.hnsw_config.m == 24
+
     print(f"✅ Created Qdrant collection: {collection_name}")
 
 
 @pytest.mark.integration
 @pytest.mark.qdrant
 @pytest.mark.asyncio
-async def test_store_and_search_vectors(qdrant_clean, mediator):
+async def test_store_and_search_vectors(async_qdrant, qdrant_pooled_collection, mediator):
     """
     Test storing vectors and searching for similar ones via CQRS.
     
     Flow:
-    1. Create collection
+    1. Take an empty collection from the session pool
     2. Store multiple vectors
     3. Search for similar vector
     4. Verify results
     """
     # Register handlers
     mediator.register_command_handler(
-        CreateCollectionCommand, CreateCollectionHandler(qdrant_clean)
+        StoreVectorsBatchCommand, StoreVectorsBatchHandler(async_qdrant)
     )
-    mediator.register_command_handler(StoreVectorCommand, StoreVectorHandler(qdrant_clean))
     mediator.register_query_handler(
-        SearchSimilarVectorsQuery, SearchSimilarVectorsHandler(qdrant_clean)
+        SearchSimilarVectorsQuery, SearchSimilarVectorsHandler(async_qdrant)
     )
 
-    # Create collection
-    collection_name = f"test_search_{uuid4().hex[:8]}"
-    vector_size = 4
-    await mediator.send_command(
-        CreateCollectionCommand(collection_name=collection_name, vector_size=vector_size)
-    )
+    # Pooled collections are pre-built with 4-dim cosine vectors
+    collection_name = qdrant_pooled_collection
 
     # Store test vectors
     test_vectors = [
@@ -195,15 +274,16 @@ async def test_store_and_search_vectors(qdrant_clean, mediator):
         ([0.0, 0.0, 1.0, 0.0], {"label": "vector_c"}),  # Different
     ]
 
-    for idx, (vector, payload) in enumerate(test_vectors):
-        await mediator.send_command(
-            StoreVectorCommand(
-                collection_name=collection_name,
-                vector_id=str(uuid4()),  # Use UUID for vector ID
-                vector=vector,
-                payload=payload,
-            )
+    # One upsert for all vectors instead of a round-trip per vector
+    await mediator.send_command(
+        StoreVectorsBatchCommand(
+            collection_name=collection_name,
+            points=[
+                PointStruct(id=str(uuid4()), vector=vector, payload=payload)
+                for vector, payload in test_vectors
+            ],
         )
+    )
 
     # Search for vectors similar to first one
     query_vector = [1.0, 0.0, 0.0, 0.0]
@@ -224,16 +304,16 @@ async def test_store_and_search_vectors(qdrant_clean, mediator):
 @pytest.mark.integration
 @pytest.mark.qdrant
 @pytest.mark.asyncio
-async def test_delete_collection(qdrant_clean, mediator):
+async def test_delete_collection(qdrant_clean, async_qdrant, mediator):
     """
     Test deleting a collection from Qdrant via CQRS.
     """
     # Register handlers
     mediator.register_command_handler(
-        CreateCollectionCommand, CreateCollectionHandler(qdrant_clean)
+        CreateCollectionCommand, CreateCollectionHandler(async_qdrant)
     )
     mediator.register_command_handler(
-        DeleteCollectionCommand, DeleteCollectionHandler(qdrant_clean)
+        DeleteCollectionCommand, DeleteCollectionHandler(async_qdrant)
     )
 
     # Create collection
@@ -244,7 +324,7 @@ async def test_delete_collection(qdrant_clean, mediator):
 
     # Verify it exists
     collections = qdrant_clean.get_collections()
-    collection_names = [c.name for c in collections.collections]
+    collection_names = {c.name for c in collections.collections}
     assert collection_name in collection_names
 
     # Delete collection
@@ -252,7 +332,7 @@ async def test_delete_collection(qdrant_clean, mediator):
 
     # Verify it's gone
     collections = qdrant_clean.get_collections()
-    collection_names = [c.name for c in collections.collections]
+    collection_names = {c.name for c in collections.collections}
     assert collection_name not in collection_names
 
     print(f"✅ Deleted Qdrant collection: {collection_name}")
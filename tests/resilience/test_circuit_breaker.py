@@ -13,6 +13,8 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "libs"))
 
+import asyncio
+import inspect
 import time
 from dataclasses import dataclass
 from enum import Enum
@@ -65,8 +67,6 @@ class CircuitBreaker:
 
         try:
             # Handle both sync and async functions
-            import asyncio
-            import inspect
             if inspect.iscoroutinefunction(func) or asyncio.iscoroutine(func):
                 result = await func(*args, **kwargs)
             else:
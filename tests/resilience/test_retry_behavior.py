@@ -13,6 +13,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "libs"))
 
+import io
 import time
 from dataclasses import dataclass
 from unittest.mock import MagicMock, patch
@@ -20,6 +21,7 @@ from uuid import uuid4
 
 import pytest
 from buildingblocks.cqrs import ICommand, ICommandHandler, IQuery, IQueryHandler
+from qdrant_client.models import Distance, PointStruct, VectorParams
 
 
 # ============================================================================
@@ -68,8 +70,6 @@ class FlakyUploadHandler(ICommandHandler):
             raise ConnectionError(f"Simulated failure (attempt {attempts + 1})")
 
         # Success on Nth attempt
-        import io
-
         data_stream = io.BytesIO(command.data)
         self.minio.put_object(
             bucket_name=command.bucket_name,
@@ -96,11 +96,11 @@ class RetryableSearchHandler(IQueryHandler):
             raise TimeoutError(f"Search timeout (attempt {attempts + 1})")
 
         # Success
-        return self.qdrant.search(
+        return self.qdrant.query_points(
             collection_name=query.collection_name,
-            query_vector=query.query_vector,
+            query=query.query_vector,
             limit=5,
-        )
+        ).points
 
 
 # ============================================================================
@@ -139,7 +139,7 @@ def retry_on_exception(max_retries=3, backoff_factor=1.0, exceptions=(Exception,
 
 @pytest.mark.resilience
 @pytest.mark.asyncio
-async def test_retry_succeeds_after_transient_failure(minio_clean):
+async def test_retry_succeeds_after_transient_failure(minio_clean, minio_prefix):
     """
     Test that retry logic recovers from transient failures.
     
@@ -155,7 +155,7 @@ async def test_retry_succeeds_after_transient_failure(minio_clean):
 
     # Execute command that will fail 2 times
     test_bucket = os.getenv("MINIO_TEST_BUCKET", "test-artifacts")
-    object_name = f"retry-test/{uuid4()}.txt"
+    object_name = f"{minio_prefix}/retry-test/{uuid4()}.txt"
 
     command = FlakyUploadCommand(
         bucket_name=test_bucket,
@@ -168,7 +168,7 @@ async def test_retry_succeeds_after_transient_failure(minio_clean):
     await retry_wrapper(command)
 
     # Verify file was uploaded
-    objects = list(minio_clean.list_objects(test_bucket, prefix="retry-test/"))
+    objects = list(minio_clean.list_objects(test_bucket, prefix=f"{minio_prefix}/retry-test/"))
     assert len(objects) > 0
     assert handler.attempt_count[object_name] == 3  # Took 3 attempts
 
@@ -177,7 +177,7 @@ async def test_retry_succeeds_after_transient_failure(minio_clean):
 
 @pytest.mark.resilience
 @pytest.mark.asyncio
-async def test_exponential_backoff_timing(minio_clean):
+async def test_exponential_backoff_timing(minio_clean, minio_prefix):
     """
     Test that exponential backoff increases wait time between retries.
     
@@ -194,7 +194,7 @@ async def test_exponential_backoff_timing(minio_clean):
         return await original_handle(command)
 
     test_bucket = os.getenv("MINIO_TEST_BUCKET", "test-artifacts")
-    object_name = f"backoff-test/{uuid4()}.txt"
+    object_name = f"{minio_prefix}/backoff-test/{uuid4()}.txt"
 
     command = FlakyUploadCommand(
         bucket_name=test_bucket,
@@ -257,8 +257,6 @@ async def test_idempotent_retry_safe(qdrant_clean):
     
     Scenario: Search query retried multiple times produces same result.
     """
-    from qdrant_client.models import Distance, PointStruct, VectorParams
-
     # Setup: Create collection with data
     collection_name = f"test_idempotent_{uuid4().hex[:8]}"
     qdrant_clean.create_collection(
@@ -306,8 +304,6 @@ async def test_non_retryable_errors_fail_immediately(redis_clean, mediator):
     
     Scenario: Invalid command should not be retried.
     """
-    from buildingblocks.cqrs import ICommand, ICommandHandler
-
     @dataclass
     class ValidatedCommand(ICommand):
         key: str
@@ -20,6 +20,7 @@ from uuid import uuid4
 
 import pytest
 from buildingblocks.cqrs import ICommand, ICommandHandler, IQuery, IQueryHandler
+from qdrant_client.models import Distance, PointStruct, VectorParams
 
 
 # ============================================================================
@@ -307,8 +308,6 @@ async def test_timeout_with_qdrant_search(qdrant_clean):
     
     Simulates slow search that needs timeout.
     """
-    from qdrant_client.models import Distance, PointStruct, VectorParams
-
     # Setup collection
     collection_name = f"test_timeout_{uuid4().hex[:8]}"
     qdrant_clean.create_collection(
@@ -326,9 +325,9 @@ async def test_timeout_with_qdrant_search(qdrant_clean):
     async def slow_search():
         # Simulate processing delay
         await asyncio.sleep(2.0)
-        return qdrant_clean.search(
-            collection_name=collection_name, query_vector=[0.5] * 128, limit=10
-        )
+        return qdrant_clean.query_points(
+            collection_name=collection_name, query=[0.5] * 128, limit=10
+        ).points
 
     # Search with timeout
     start = time.time()
@@ -0,0 +1,79 @@
+"""
+Unit tests for the Redis cache value codec
+"""
+
+from datetime import datetime
+
+import orjson
+import pytest
+
+from libs.buildingblocks.messaging.cache_codec import (
+    COMPRESSION_THRESHOLD,
+    decode_cache_value,
+    encode_cache_value,
+)
+
+
+def search_hits(count):
+    return [
+        {"id": f"doc{i}", "score": 0.5, "payload": {"title": f"Document {i}", "tags": ["a", "b"]}}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.unit
+def test_cache_codec_keeps_small_values_as_json():
+    """
+    Test that values under the threshold are stored as plain JSON.
+    """
+    value = search_hits(1)
+
+    blob = encode_cache_value(value)
+
+    assert blob == orjson.dumps(value)
+    assert decode_cache_value(blob) == value
+    print("✅ Cache codec kept small value as JSON")
+
+
+@pytest.mark.unit
+def test_cache_codec_compresses_large_values():
+    """
+    Test that values over the threshold are compressed and round-trip.
+    """
+    value = search_hits(100)
+    assert len(orjson.dumps(value)) > COMPRESSION_THRESHOLD
+
+    blob = encode_cache_value(value)
+
+    assert len(blob) < len(orjson.dumps(value)) // 2
+    assert decode_cache_value(blob) == value
+    print("✅ Cache codec compressed large value")
+
+
+@pytest.mark.unit
+def test_cache_codec_decodes_plain_json_text():
+    """
+    Test that JSON read back as text (decode_responses clients) still decodes.
+    """
+    assert decode_cache_value('{"title": "Doc 1"}') == {"title": "Doc 1"}
+    print("✅ Cache codec decoded JSON text")
+
+
+@pytest.mark.unit
+def test_cache_codec_serializes_numpy_values_and_naive_datetimes():
+    """
+    Test that numpy metrics need no conversion and naive datetimes are written as UTC.
+    """
+    np = pytest.importorskip("numpy")
+    value = {
+        "accuracy": np.float32(0.5),
+        "losses": np.array([0.25, 0.125]),
+        "logged_at": datetime(2025, 1, 1, 12, 0),
+    }
+
+    assert decode_cache_value(encode_cache_value(value)) == {
+        "accuracy": 0.5,
+        "losses": [0.25, 0.125],
+        "logged_at": "2025-01-01T12:00:00+00:00",
+    }
+    print("✅ Cache codec serialized numpy values and naive datetimes")
@@ -8,6 +8,7 @@ from typing import Any
 
 import pytest
 
+import libs.buildingblocks.cqrs.mediator as mediator_module
 from libs.buildingblocks.behaviors import IPipelineBehavior
 from libs.buildingblocks.cqrs.interfaces import (
     ICommand,
@@ -315,6 +316,65 @@ async def test_mediator_pipeline_without_behaviors():
     print("✅ Mediator works without pipeline behaviors")
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_mediator_uses_handler_registered_after_first_send():
+    """
+    Test that re-registering a handler replaces the one compiled on the first send.
+    """
+    mediator = EnterpriseMediator()
+    first_handler = TestCommandHandler()
+    second_handler = TestCommandHandler()
+
+    mediator.register_command_handler(TestCommand, first_handler)
+    await mediator.send_command(TestCommand(value="first"))
+    mediator.register_command_handler(TestCommand, second_handler)
+    await mediator.send_command(TestCommand(value="second"))
+
+    assert [c.value for c in first_handler.handled_commands] == ["first"]
+    assert [c.value for c in second_handler.handled_commands] == ["second"]
+    print("✅ Re-registered handler replaced the compiled one")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_mediator_applies_behavior_added_after_first_send():
+    """
+    Test that a behavior added after a request type was sent wraps later sends.
+    """
+    mediator = EnterpriseMediator()
+    mediator.register_query_handler(TestQuery, TestQueryHandler())
+    await mediator.send_query(TestQuery(search="before"))
+
+    behavior = TestPipelineBehavior()
+    mediator.add_pipeline_behavior(behavior)
+    result = await mediator.send_query(TestQuery(search="after"))
+
+    assert result == "Found: after"
+    assert behavior.call_count == 1
+    print("✅ Behavior added after first send wrapped later sends")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_mediator_skips_behaviors_cleared_after_first_send():
+    """
+    Test that clearing behaviors drops them from pipelines compiled by earlier sends.
+    """
+    mediator = EnterpriseMediator()
+    mediator.register_query_handler(TestQuery, TestQueryHandler())
+    behavior = TestPipelineBehavior()
+    mediator.add_pipeline_behavior(behavior)
+    await mediator.send_query(TestQuery(search="before"))
+
+    mediator.clear_pipeline_behaviors()
+    result = await mediator.send_query(TestQuery(search="after"))
+
+    assert result == "Found: after"
+    assert behavior.call_count == 1
+    print("✅ Cleared behaviors no longer ran")
+
+
 @pytest.mark.unit
 def test_legacy_mediator_shows_deprecation_warning():
     """
@@ -337,8 +397,6 @@ def test_get_mediator_returns_singleton():
     Test that get_mediator returns the same instance (singleton pattern).
     """
     # Reset global instance
-    import libs.buildingblocks.cqrs.mediator as mediator_module
-
     mediator_module._mediator_instance = None
 
     mediator1 = get_mediator()
@@ -354,8 +412,6 @@ def test_configure_mediator_with_enterprise():
     """
     Test that configure_mediator creates EnterpriseMediator by default.
     """
-    import libs.buildingblocks.cqrs.mediator as mediator_module
-
     mediator_module._mediator_instance = None
 
     mediator = configure_mediator(use_enterprise=True)
@@ -370,8 +426,6 @@ def test_configure_mediator_with_custom_instance():
     """
     Test that configure_mediator accepts custom mediator instance.
     """
-    import libs.buildingblocks.cqrs.mediator as mediator_module
-
     mediator_module._mediator_instance = None
 
     custom_mediator = EnterpriseMediator()
@@ -386,8 +440,6 @@ def test_configure_mediator_with_pipeline_behaviors():
     """
     Test that configure_mediator adds pipeline behaviors to mediator.
     """
-    import libs.buildingblocks.cqrs.mediator as mediator_module
-
     mediator_module._mediator_instance = None
 
     behavior = TestPipelineBehavior()
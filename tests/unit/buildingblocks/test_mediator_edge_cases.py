@@ -4,6 +4,7 @@ Unit tests for EnterpriseMediator edge cases and missing coverage
 
 import pytest
 import warnings
+import libs.buildingblocks.cqrs.mediator as mediator_module
 from libs.buildingblocks.cqrs.mediator import (
     EnterpriseMediator,
     Mediator,
@@ -260,8 +261,6 @@ def test_get_mediator_creates_instance_on_first_call():
     Test get_mediator() creates singleton instance.
     """
     # Reset global state
-    import libs.buildingblocks.cqrs.mediator as mediator_module
-
     mediator_module._mediator_instance = None
 
     mediator1 = get_mediator()
@@ -291,8 +290,6 @@ def test_configure_mediator_with_legacy_flag():
     """
     Test configure_mediator with use_enterprise=False (creates legacy Mediator).
     """
-    import libs.buildingblocks.cqrs.mediator as mediator_module
-
     mediator_module._mediator_instance = None
 
     with warnings.catch_warnings(record=True):
@@ -308,8 +305,6 @@ def test_configure_mediator_with_pipeline_behaviors():
     """
     Test configure_mediator adds pipeline behaviors.
     """
-    import libs.buildingblocks.cqrs.mediator as mediator_module
-
     mediator_module._mediator_instance = None
 
     class MockBehavior(IPipelineBehavior):
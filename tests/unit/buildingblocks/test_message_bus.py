@@ -2,6 +2,7 @@
 Unit tests for EnterpriseMessageBus and related components
 """
 
+import logging
 import pytest
 import json
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
@@ -313,8 +314,6 @@ def test_register_command_handler():
 @pytest.mark.unit
 def test_register_command_handler_warns_on_override(caplog):
     """Test that registering duplicate command handler logs warning"""
-    import logging
-
     with caplog.at_level(logging.WARNING):
         mock_celery = Mock()
         bus = EnterpriseMessageBus(mock_celery)
@@ -574,8 +573,6 @@ async def test_handle_message_failure_sends_to_dlq():
 @pytest.mark.unit
 def test_legacy_celery_message_bus_logs_warning(caplog):
     """Test that legacy CeleryMessageBus logs deprecation warning"""
-    import logging
-
     with caplog.at_level(logging.WARNING):
         mock_celery = Mock()
         bus = CeleryMessageBus(mock_celery)
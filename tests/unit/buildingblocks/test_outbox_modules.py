@@ -61,6 +61,7 @@ def test_outbox_cqrs_command_classes_structure():
     assert "class SaveEventToOutboxCommand" in content
     assert "class SaveEventsToOutboxCommand" in content
     assert "class MarkEventAsPublishedCommand" in content
+    assert "class MarkEventsAsPublishedCommand" in content
     assert "class MarkEventAsFailedCommand" in content
     assert "class CleanupPublishedEventsCommand" in content
     print("✅ outbox_cqrs has all expected command classes")
@@ -93,6 +94,7 @@ def test_outbox_cqrs_handler_classes_structure():
     assert "class SaveEventToOutboxHandler" in content
     assert "class SaveEventsToOutboxHandler" in content
     assert "class MarkEventAsPublishedHandler" in content
+    assert "class MarkEventsAsPublishedHandler" in content
     assert "class MarkEventAsFailedHandler" in content
     assert "class CleanupPublishedEventsHandler" in content
     assert "class GetUnpublishedEventsHandler" in content
@@ -14,6 +14,7 @@ from libs.buildingblocks.behaviors.pipeline_behaviors import (
     AuthorizationBehavior,
     CachingBehavior,
     CircuitBreakerBehavior,
+    ConcurrencyLimitBehavior,
     IPipelineBehavior,
     LoggingBehavior,
     RateLimitingBehavior,
@@ -106,6 +107,11 @@ class CircuitBreakerCommand(ICommand):
         self.circuit_breaker_key = circuit_breaker_key
 
 
+class ConcurrencyLimitedCommand(ICommand):
+    def __init__(self, concurrency_limit_key: str):
+        self.concurrency_limit_key = concurrency_limit_key
+
+
 # Helper functions
 async def success_handler():
     """Handler that succeeds"""
@@ -117,6 +123,25 @@ async def failing_handler():
     raise ValueError("Handler failed")
 
 
+class FastAsyncRecorder:
+    """Plain async handler that counts calls - much cheaper than AsyncMock in loops"""
+
+    __slots__ = ("call_count", "return_value", "side_effect")
+
+    def __init__(self, *, return_value=None, side_effect=None):
+        self.call_count = 0
+        self.return_value = return_value
+        self.side_effect = side_effect
+
+    async def __call__(self, *args, **kwargs):
+        self.call_count += 1
+        if self.side_effect is not None:
+            if isinstance(self.side_effect, BaseException):
+                raise self.side_effect
+            return self.side_effect()
+        return self.return_value
+
+
 # ============================================================================
 # ValidationBehavior Tests
 # ============================================================================
@@ -484,6 +509,87 @@ async def test_caching_behavior_expires_after_ttl():
     print("✅ CachingBehavior expired cache after TTL")
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_caching_behavior_deduplicates_concurrent_misses():
+    """
+    Test that concurrent misses for the same cache key share one handler call.
+    """
+    behavior = CachingBehavior(cache_ttl=60)
+    call_count = 0
+
+    async def slow_handler():
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.05)
+        return f"result_{call_count}"
+
+    query = CacheableQuery(cache_key="test-key")
+
+    results = await asyncio.gather(*(behavior.handle(query, slow_handler) for _ in range(5)))
+
+    assert results == ["result_1"] * 5
+    assert call_count == 1
+    print("✅ CachingBehavior deduplicated concurrent misses")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_caching_behavior_propagates_inflight_failure():
+    """
+    Test that a failed in-flight miss raises for every waiter and is not cached.
+    """
+    behavior = CachingBehavior(cache_ttl=60)
+
+    async def slow_failing_handler():
+        await asyncio.sleep(0.05)
+        raise ValueError("Handler failed")
+
+    query = CacheableQuery(cache_key="test-key")
+
+    results = await asyncio.gather(
+        *(behavior.handle(query, slow_failing_handler) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+    # Nothing cached - next call runs the handler
+    result = await behavior.handle(query, success_handler)
+    assert result == "success"
+    print("✅ CachingBehavior propagated in-flight failure")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_caching_behavior_survives_cancelled_inflight_leader():
+    """
+    Test that cancelling the request computing a miss lets a waiter take it over.
+    """
+    behavior = CachingBehavior(cache_ttl=60)
+    call_count = 0
+
+    async def slow_handler():
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.05)
+        return f"result_{call_count}"
+
+    query = CacheableQuery(cache_key="test-key")
+
+    leader = asyncio.create_task(behavior.handle(query, slow_handler))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(behavior.handle(query, slow_handler))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    assert await waiter == "result_2"
+    assert leader.cancelled()
+    assert call_count == 2
+    print("✅ CachingBehavior waiter took over cancelled in-flight miss")
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_caching_behavior_skips_non_cacheable():
@@ -564,16 +670,18 @@ async def test_rate_limiting_behavior_rejects_over_limit():
     """
     behavior = RateLimitingBehavior(requests_per_minute=3)
     command = RateLimitedCommand(rate_limit_key="user-123")
+    handler = FastAsyncRecorder(return_value="success")
 
     # Allow 3 requests
     for i in range(3):
-        await behavior.handle(command, success_handler)
+        await behavior.handle(command, handler)
 
-    # 4th request should be rejected
+    # 4th request should be rejected without reaching the handler
     with pytest.raises(RateLimitExceededException) as exc_info:
-        await behavior.handle(command, success_handler)
+        await behavior.handle(command, handler)
 
     assert exc_info.value.rate_limit_key == "user-123"
+    assert handler.call_count == 3
     print("✅ RateLimitingBehavior rejected request over limit")
 
 
@@ -604,6 +712,72 @@ async def test_rate_limiting_behavior_per_key():
     print("✅ RateLimitingBehavior tracked limits per key")
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rate_limiting_behavior_refills_over_time():
+    """
+    Test that RateLimitingBehavior refills tokens continuously instead of per fixed window.
+    """
+    behavior = RateLimitingBehavior(requests_per_minute=600)  # 10 tokens per second
+    command = RateLimitedCommand(rate_limit_key="user-123")
+
+    # Drain the bucket
+    for i in range(600):
+        await behavior.handle(command, success_handler)
+
+    with pytest.raises(RateLimitExceededException):
+        await behavior.handle(command, success_handler)
+
+    # ~2 tokens refill after 200ms
+    await asyncio.sleep(0.2)
+
+    result = await behavior.handle(command, success_handler)
+    assert result == "success"
+
+    print("✅ RateLimitingBehavior refilled tokens over time")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rate_limiting_behavior_caps_burst():
+    """
+    Test that RateLimitingBehavior limits back-to-back requests to the burst size.
+    """
+    behavior = RateLimitingBehavior(requests_per_minute=60, burst=2)
+    command = RateLimitedCommand(rate_limit_key="user-123")
+
+    await behavior.handle(command, success_handler)
+    await behavior.handle(command, success_handler)
+
+    # Sustained rate allows 60/min, but only 2 may arrive at once
+    with pytest.raises(RateLimitExceededException) as exc_info:
+        await behavior.handle(command, success_handler)
+
+    assert exc_info.value.rate_limit_key == "user-123"
+    print("✅ RateLimitingBehavior capped burst size")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rate_limiting_behavior_evicts_least_recently_used_keys():
+    """
+    Test that RateLimitingBehavior bounds tracked keys and evicts the least recently used.
+    """
+    behavior = RateLimitingBehavior(requests_per_minute=1, max_tracked_keys=2)
+
+    await behavior.handle(RateLimitedCommand(rate_limit_key="user-1"), success_handler)
+    await behavior.handle(RateLimitedCommand(rate_limit_key="user-2"), success_handler)
+    await behavior.handle(RateLimitedCommand(rate_limit_key="user-3"), success_handler)
+
+    assert list(behavior._buckets) == ["user-2", "user-3"]
+
+    # Evicted key starts over with a full bucket
+    result = await behavior.handle(RateLimitedCommand(rate_limit_key="user-1"), success_handler)
+    assert result == "success"
+
+    print("✅ RateLimitingBehavior evicted least recently used keys")
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_rate_limiting_behavior_skips_without_key():
@@ -638,17 +812,19 @@ async def test_circuit_breaker_behavior_opens_after_failures():
     """
     behavior = CircuitBreakerBehavior(failure_threshold=3, recovery_timeout=60)
     command = CircuitBreakerCommand(circuit_breaker_key="service-a")
+    handler = FastAsyncRecorder(side_effect=ValueError("Handler failed"))
 
     # Cause 3 failures
     for i in range(3):
         with pytest.raises(ValueError):
-            await behavior.handle(command, failing_handler)
+            await behavior.handle(command, handler)
 
-    # Circuit should now be open
+    # Circuit should now be open and short-circuit the handler
     with pytest.raises(CircuitBreakerOpenException) as exc_info:
-        await behavior.handle(command, success_handler)
+        await behavior.handle(command, handler)
 
     assert exc_info.value.circuit_key == "service-a"
+    assert handler.call_count == 3
     print("✅ CircuitBreakerBehavior opened after failures")
 
 
@@ -677,6 +853,41 @@ async def test_circuit_breaker_behavior_resets_on_success():
     print("✅ CircuitBreakerBehavior reset on success")
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_circuit_breaker_behavior_half_opens_after_recovery_timeout():
+    """
+    Test that CircuitBreakerBehavior lets a probe through after recovery_timeout.
+    """
+    behavior = CircuitBreakerBehavior(failure_threshold=2, recovery_timeout=0.1)
+    command = CircuitBreakerCommand(circuit_breaker_key="service-a")
+
+    for i in range(2):
+        with pytest.raises(ValueError):
+            await behavior.handle(command, failing_handler)
+
+    with pytest.raises(CircuitBreakerOpenException):
+        await behavior.handle(command, success_handler)
+
+    await asyncio.sleep(0.15)
+
+    # Failed probe re-opens the circuit immediately
+    with pytest.raises(ValueError):
+        await behavior.handle(command, failing_handler)
+    with pytest.raises(CircuitBreakerOpenException):
+        await behavior.handle(command, success_handler)
+
+    await asyncio.sleep(0.15)
+
+    # Successful probe closes the circuit
+    result = await behavior.handle(command, success_handler)
+    assert result == "success"
+    result = await behavior.handle(command, success_handler)
+    assert result == "success"
+
+    print("✅ CircuitBreakerBehavior half-opened after recovery timeout")
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_circuit_breaker_behavior_per_key():
@@ -723,3 +934,81 @@ async def test_circuit_breaker_behavior_skips_without_key():
             await behavior.handle(command, failing_handler)
 
     print("✅ CircuitBreakerBehavior skipped request without key")
+
+
+# ============================================================================
+# ConcurrencyLimitBehavior Tests
+# ============================================================================
+
+
+class InFlightTracker:
+    """Handler factory that records the peak number of concurrent calls"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    def handler(self):
+        async def handle():
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return "success"
+
+        return handle
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrency_limit_behavior_caps_in_flight_requests():
+    """
+    Test that ConcurrencyLimitBehavior runs at most max_concurrent requests per key at once.
+    """
+    behavior = ConcurrencyLimitBehavior(max_concurrent=2)
+    tracker = InFlightTracker()
+    command = ConcurrencyLimitedCommand(concurrency_limit_key="qdrant")
+
+    results = await asyncio.gather(*(behavior.handle(command, tracker.handler()) for _ in range(6)))
+
+    assert results == ["success"] * 6
+    assert tracker.peak == 2
+    print("✅ ConcurrencyLimitBehavior capped in-flight requests")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrency_limit_behavior_per_key():
+    """
+    Test that ConcurrencyLimitBehavior gives each key its own slots.
+    """
+    behavior = ConcurrencyLimitBehavior(max_concurrent=1)
+    tracker = InFlightTracker()
+
+    await asyncio.gather(
+        behavior.handle(ConcurrencyLimitedCommand("qdrant"), tracker.handler()),
+        behavior.handle(ConcurrencyLimitedCommand("minio"), tracker.handler()),
+    )
+
+    assert tracker.peak == 2
+    print("✅ ConcurrencyLimitBehavior limited each key separately")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrency_limit_behavior_skips_without_key():
+    """
+    Test that ConcurrencyLimitBehavior does not limit requests without concurrency_limit_key.
+    """
+    behavior = ConcurrencyLimitBehavior(max_concurrent=1)
+    tracker = InFlightTracker()
+
+    class UnlimitedCommand(ICommand):
+        pass
+
+    await asyncio.gather(
+        *(behavior.handle(UnlimitedCommand(), tracker.handler()) for _ in range(3))
+    )
+
+    assert tracker.peak == 3
+    print("✅ ConcurrencyLimitBehavior skipped request without key")
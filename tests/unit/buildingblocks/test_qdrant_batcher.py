@@ -0,0 +1,107 @@
+"""
+Unit tests for QdrantBatcher
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from libs.buildingblocks.messaging.qdrant_batcher import QdrantBatcher
+
+
+class RecordingQdrantClient:
+    """Stand-in sync Qdrant client that records each upsert call"""
+
+    def __init__(self, fail=False):
+        self.upserts = []
+        self.fail = fail
+
+    def upsert(self, collection_name, points):
+        if self.fail:
+            raise RuntimeError("qdrant unavailable")
+        self.upserts.append((collection_name, [point.id for point in points]))
+
+
+class RecordingAsyncQdrantClient(RecordingQdrantClient):
+    """Stand-in AsyncQdrantClient"""
+
+    async def upsert(self, collection_name, points):
+        super().upsert(collection_name, points)
+
+
+def point(point_id, version=1):
+    return SimpleNamespace(id=point_id, vector=[0.0, 1.0], payload={"version": version})
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_qdrant_batcher_coalesces_concurrent_upserts():
+    """
+    Test that concurrent single-point adds are written with one upsert per collection.
+    """
+    client = RecordingQdrantClient()
+    batcher = QdrantBatcher(client, max_batch_size=32, max_wait=0.01)
+
+    await asyncio.gather(
+        *(batcher.add("docs", point(i)) for i in range(20)),
+        batcher.add("videos", point("v1")),
+    )
+
+    assert sorted(client.upserts) == [("docs", list(range(20))), ("videos", ["v1"])]
+    print("✅ QdrantBatcher coalesced concurrent upserts")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_qdrant_batcher_flushes_full_batch_and_keeps_last_write():
+    """
+    Test that a full batch is written without waiting and duplicate ids keep the last point.
+    """
+    client = RecordingQdrantClient()
+    batcher = QdrantBatcher(client, max_batch_size=3, max_wait=10)
+
+    await asyncio.wait_for(
+        asyncio.gather(
+            batcher.add("docs", point("a", version=1)),
+            batcher.add("docs", point("b")),
+            batcher.add("docs", point("a", version=2)),
+        ),
+        timeout=1,
+    )
+
+    assert client.upserts == [("docs", ["a", "b"])]
+    print("✅ QdrantBatcher flushed a full batch immediately")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_qdrant_batcher_propagates_upsert_failure():
+    """
+    Test that every caller in a failed batch sees the upsert error.
+    """
+    batcher = QdrantBatcher(RecordingQdrantClient(fail=True), max_wait=0.01)
+
+    results = await asyncio.gather(
+        batcher.add("docs", point(1)),
+        batcher.add("docs", point(2)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    print("✅ QdrantBatcher propagated upsert failure")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_qdrant_batcher_awaits_async_client():
+    """
+    Test that an async client's upsert is awaited directly.
+    """
+    client = RecordingAsyncQdrantClient()
+    batcher = QdrantBatcher(client, max_wait=0.01)
+
+    await asyncio.gather(batcher.add("docs", point(1)), batcher.add("docs", point(2)))
+
+    assert client.upserts == [("docs", [1, 2])]
+    print("✅ QdrantBatcher awaited async client")
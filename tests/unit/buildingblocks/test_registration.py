@@ -2,6 +2,8 @@
 Unit tests for HandlerRegistry and HandlerDecorator
 """
 
+import sys
+
 import pytest
 from typing import Any
 from libs.buildingblocks.cqrs.registration import HandlerRegistry, HandlerDecorator
@@ -60,6 +62,17 @@ class NotAHandler:
         pass
 
 
+# Handlers defined above that module discovery is expected to find
+EXPECTED_DISCOVERED_HANDLERS = frozenset(
+    {
+        "TestRegistrationCommandHandler",
+        "TestRegistrationCommandWithResponseHandler",
+        "TestRegistrationQueryHandler",
+        "HandlerWithoutGenerics",
+    }
+)
+
+
 # ============================================================================
 # HandlerRegistry.get_request_type_from_handler Tests
 # ============================================================================
@@ -290,18 +303,13 @@ def test_discover_handlers_in_module():
     """
     Test discovering handlers in the current test module.
     """
-    import sys
-
     current_module = sys.modules[__name__]
 
     discovered = HandlerRegistry.discover_handlers_in_module(current_module)
 
     # Should find our test handlers
-    handler_names = [h.__name__ for h in discovered]
-    assert "TestRegistrationCommandHandler" in handler_names
-    assert "TestRegistrationCommandWithResponseHandler" in handler_names
-    assert "TestRegistrationQueryHandler" in handler_names
-    assert "HandlerWithoutGenerics" in handler_names
+    handler_names = {h.__name__ for h in discovered}
+    assert EXPECTED_DISCOVERED_HANDLERS <= handler_names
 
     # Should NOT find the interface classes or non-handlers
     assert "ICommandHandler" not in handler_names
@@ -314,8 +322,6 @@ def test_discover_handlers_excludes_interface_classes():
     """
     Test that discover_handlers_in_module excludes the interface base classes.
     """
-    import sys
-
     current_module = sys.modules[__name__]
 
     discovered = HandlerRegistry.discover_handlers_in_module(current_module)
@@ -398,8 +404,6 @@ async def test_full_registration_and_execution_flow():
     """
     Integration test: Discover, register, and execute handlers.
     """
-    import sys
-
     current_module = sys.modules[__name__]
 
     # Discover handlers
@@ -2,6 +2,11 @@
 Unit tests for TransactionBehavior and OutboxBehavior
 """
 
+import logging
+import sys
+from dataclasses import dataclass
+from uuid import uuid4
+
 import pytest
 from unittest.mock import Mock, AsyncMock, MagicMock
 
@@ -9,7 +14,13 @@ from libs.buildingblocks.behaviors.pipeline_behaviors import (
     TransactionBehavior,
     OutboxBehavior,
 )
-from libs.buildingblocks.cqrs.interfaces import ICommand, ICommandWithResponse, IQuery
+from libs.buildingblocks.cqrs.interfaces import (
+    ICommand,
+    ICommandHandler,
+    ICommandWithResponse,
+    IQuery,
+)
+from libs.buildingblocks.cqrs.mediator import EnterpriseMediator
 from libs.buildingblocks.exceptions.pipeline_exceptions import TransactionPipelineException
 
 
@@ -37,6 +48,19 @@ class MockDBSession:
         self.in_transaction_flag = False
 
 
+class MockAsyncDBSession(MockDBSession):
+    # Like AsyncSession, nothing happens unless the returned coroutine is awaited
+    async def begin(self):
+        super().begin()
+
+    async def commit(self):
+        super().commit()
+
+    async def rollback(self):
+        self.rolled_back = True
+        self.in_transaction_flag = False
+
+
 # Test Commands
 class TransactionalCommand(ICommand):
     def __init__(self, db_session=None):
@@ -65,6 +89,91 @@ class QueryWithDomainEvents(IQuery[str]):
         self.domain_events = events or []
 
 
+@dataclass(frozen=True, slots=True)
+class MockDomainEvent:
+    event_type: str
+    data: str
+
+
+@pytest.fixture(scope="module")
+def prebuilt_events():
+    """Immutable domain events shared across the module (tests never mutate them)"""
+    return (
+        MockDomainEvent("UserCreated", "123"),
+        MockDomainEvent("EmailSent", "test@example.com"),
+        MockDomainEvent("EventFromCommandWithResponse", "999"),
+    )
+
+
+# Stand-ins for the outbox CQRS commands (real module has import path issues)
+class MockSaveEventToOutboxCommand:
+    def __init__(self, event, correlation_id, db_session):
+        self.event = event
+        self.correlation_id = correlation_id
+        self.db_session = db_session
+
+
+class MockSaveEventsToOutboxCommand:
+    def __init__(self, events, correlation_id, db_session):
+        self.events = events
+        self.correlation_id = correlation_id
+        self.db_session = db_session
+
+
+class RecordingSaveHandler(ICommandHandler):
+    """Records every outbox save command dispatched through the mediator"""
+
+    def __init__(self):
+        self.commands = []
+
+    async def handle(self, command):
+        self.commands.append(command)
+
+
+OUTBOX_CQRS_MODULE = "libs.buildingblocks.messaging.outbox_cqrs"
+
+
+@pytest.fixture(scope="module")
+def outbox_cqrs_module():
+    """Install the stand-in outbox_cqrs module once for the whole test module"""
+    mock_outbox_module = MagicMock()
+    mock_outbox_module.SaveEventToOutboxCommand = MockSaveEventToOutboxCommand
+    mock_outbox_module.SaveEventsToOutboxCommand = MockSaveEventsToOutboxCommand
+
+    original = sys.modules.get(OUTBOX_CQRS_MODULE)
+    sys.modules[OUTBOX_CQRS_MODULE] = mock_outbox_module
+    yield mock_outbox_module
+
+    if original is None:
+        sys.modules.pop(OUTBOX_CQRS_MODULE, None)
+    else:
+        sys.modules[OUTBOX_CQRS_MODULE] = original
+
+
+@pytest.fixture(scope="module")
+def recording_save_handler():
+    """Module-scoped recorder for the outbox save commands"""
+    return RecordingSaveHandler()
+
+
+@pytest.fixture(scope="module")
+def outbox_mediator(outbox_cqrs_module, recording_save_handler):
+    """Module-scoped mediator with the outbox save handlers registered once"""
+    mediator = EnterpriseMediator()
+    mediator.register_command_handler(MockSaveEventToOutboxCommand, recording_save_handler)
+    mediator.register_command_handler(MockSaveEventsToOutboxCommand, recording_save_handler)
+    return mediator
+
+
+@pytest.fixture
+def outbox_save_handler(outbox_mediator, recording_save_handler):
+    """Per-test view of the shared save handler, reset after each test"""
+    yield recording_save_handler
+
+    recording_save_handler.commands.clear()
+    outbox_mediator.clear_pipeline_behaviors()
+
+
 # Helper functions
 async def success_handler():
     """Handler that succeeds"""
@@ -117,8 +226,6 @@ async def test_transaction_behavior_skips_without_db_session(caplog):
     """
     Test that TransactionBehavior logs warning and continues without db_session.
     """
-    import logging
-
     with caplog.at_level(logging.WARNING):
         behavior = TransactionBehavior()
         command = TransactionalCommand(db_session=None)
@@ -218,14 +325,49 @@ async def test_transaction_behavior_rolls_back_on_error():
     print("✅ TransactionBehavior rolled back on error")
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_transaction_behavior_awaits_async_begin_and_commit():
+    """
+    Test that TransactionBehavior awaits begin() and commit() on an async session.
+    """
+    behavior = TransactionBehavior(auto_commit=True)
+    db_session = MockAsyncDBSession()
+    command = TransactionalCommand(db_session=db_session)
+
+    result = await behavior.handle(command, success_handler)
+
+    assert result == "success"
+    assert db_session.begun is True
+    assert db_session.committed is True
+    assert db_session.rolled_back is False
+    print("✅ TransactionBehavior awaited async begin and commit")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_transaction_behavior_awaits_async_rollback():
+    """
+    Test that TransactionBehavior finishes an async rollback before raising.
+    """
+    behavior = TransactionBehavior()
+    db_session = MockAsyncDBSession()
+    command = TransactionalCommand(db_session=db_session)
+
+    with pytest.raises(TransactionPipelineException):
+        await behavior.handle(command, failing_handler)
+
+    assert db_session.rolled_back is True
+    assert db_session.committed is False
+    print("✅ TransactionBehavior awaited async rollback")
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_transaction_behavior_preserves_original_exception(caplog):
     """
     Test that TransactionBehavior logs original exception during rollback.
     """
-    import logging
-
     with caplog.at_level(logging.ERROR):
         behavior = TransactionBehavior()
         db_session = MockDBSession()
@@ -298,8 +440,6 @@ async def test_outbox_behavior_warns_without_db_session(caplog):
     """
     Test that OutboxBehavior warns when db_session is missing.
     """
-    import logging
-
     with caplog.at_level(logging.WARNING):
         behavior = OutboxBehavior()
         command = CommandWithDomainEvents(events=["event1"], db_session=None)
@@ -317,8 +457,6 @@ async def test_outbox_behavior_errors_without_mediator(caplog):
     """
     Test that OutboxBehavior logs error when mediator is not configured.
     """
-    import logging
-
     with caplog.at_level(logging.ERROR):
         behavior = OutboxBehavior(mediator=None)
         db_session = Mock()
@@ -333,83 +471,86 @@ async def test_outbox_behavior_errors_without_mediator(caplog):
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_outbox_behavior_saves_single_event(monkeypatch):
+async def test_outbox_behavior_saves_single_event(
+    outbox_mediator, outbox_save_handler, prebuilt_events
+):
     """
     Test that OutboxBehavior saves single domain event to outbox.
     """
-    # Mock the SaveEventToOutboxCommand class
-    class MockSaveEventToOutboxCommand:
-        def __init__(self, event, correlation_id, db_session):
-            self.event = event
-            self.correlation_id = correlation_id
-            self.db_session = db_session
-
-    # Patch the import to avoid the import error
-    import sys
-    from unittest.mock import MagicMock
-
-    mock_outbox_module = MagicMock()
-    mock_outbox_module.SaveEventToOutboxCommand = MockSaveEventToOutboxCommand
-    sys.modules["libs.buildingblocks.messaging.outbox_cqrs"] = mock_outbox_module
-
-    mock_mediator = AsyncMock()
-    behavior = OutboxBehavior(mediator=mock_mediator)
+    behavior = OutboxBehavior(mediator=outbox_mediator)
     db_session = Mock()
-    event = {"type": "UserCreated", "user_id": "123"}
+    event = prebuilt_events[0]
+    correlation_id = uuid4()
     command = CommandWithDomainEvents(
-        events=[event], db_session=db_session, correlation_id="test-123"
+        events=[event], db_session=db_session, correlation_id=correlation_id
     )
 
     result = await behavior.handle(command, success_handler)
 
     assert result == "success"
-    assert mock_mediator.send_command.called
-    call_args = mock_mediator.send_command.call_args[0][0]
-    assert hasattr(call_args, "event")
-    assert call_args.event == event
+    assert len(outbox_save_handler.commands) == 1
+    saved_command = outbox_save_handler.commands[0]
+    assert isinstance(saved_command, MockSaveEventToOutboxCommand)
+    assert saved_command.event == event
+    assert saved_command.correlation_id == correlation_id
     print("✅ OutboxBehavior saved single event")
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_outbox_behavior_saves_multiple_events(monkeypatch):
+async def test_outbox_behavior_saves_multiple_events(
+    outbox_mediator, outbox_save_handler, prebuilt_events
+):
     """
     Test that OutboxBehavior saves multiple domain events to outbox.
     """
-    # Mock the SaveEventsToOutboxCommand class
-    class MockSaveEventsToOutboxCommand:
-        def __init__(self, events, correlation_id, db_session):
-            self.events = events
-            self.correlation_id = correlation_id
-            self.db_session = db_session
+    behavior = OutboxBehavior(mediator=outbox_mediator)
+    db_session = Mock()
+    events = list(prebuilt_events[:2])
+    correlation_id = uuid4()
+    command = CommandWithDomainEvents(
+        events=events, db_session=db_session, correlation_id=correlation_id
+    )
 
-    # Patch the import
-    import sys
-    from unittest.mock import MagicMock
+    result = await behavior.handle(command, success_handler)
 
-    mock_outbox_module = MagicMock()
-    mock_outbox_module.SaveEventsToOutboxCommand = MockSaveEventsToOutboxCommand
-    sys.modules["libs.buildingblocks.messaging.outbox_cqrs"] = mock_outbox_module
+    assert result == "success"
+    assert len(outbox_save_handler.commands) == 1
+    saved_command = outbox_save_handler.commands[0]
+    assert isinstance(saved_command, MockSaveEventsToOutboxCommand)
+    assert saved_command.events == events
+    assert saved_command.correlation_id == correlation_id
+    print("✅ OutboxBehavior saved multiple events")
 
-    mock_mediator = AsyncMock()
-    behavior = OutboxBehavior(mediator=mock_mediator)
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_outbox_behavior_uses_direct_saver(
+    outbox_mediator, outbox_save_handler, prebuilt_events
+):
+    """
+    Test that OutboxBehavior calls the saver directly instead of dispatching via the mediator.
+    """
+    saver = RecordingSaveHandler()
+    behavior = OutboxBehavior(mediator=outbox_mediator, saver=saver)
     db_session = Mock()
-    events = [
-        {"type": "UserCreated", "user_id": "123"},
-        {"type": "EmailSent", "email": "test@example.com"},
-    ]
+    event = prebuilt_events[0]
+    correlation_id = uuid4()
     command = CommandWithDomainEvents(
-        events=events, db_session=db_session, correlation_id="test-456"
+        events=[event], db_session=db_session, correlation_id=correlation_id
     )
 
     result = await behavior.handle(command, success_handler)
 
     assert result == "success"
-    assert mock_mediator.send_command.called
-    call_args = mock_mediator.send_command.call_args[0][0]
-    assert hasattr(call_args, "events")
-    assert call_args.events == events
-    print("✅ OutboxBehavior saved multiple events")
+    assert outbox_save_handler.commands == []
+    assert len(saver.commands) == 1
+    saved_command = saver.commands[0]
+    assert isinstance(saved_command, MockSaveEventsToOutboxCommand)
+    assert saved_command.events == [event]
+    assert saved_command.correlation_id == correlation_id
+    assert saved_command.db_session is db_session
+    print("✅ OutboxBehavior saved events through direct saver")
 
 
 @pytest.mark.unit
@@ -418,8 +559,6 @@ async def test_outbox_behavior_continues_on_save_failure(caplog):
     """
     Test that OutboxBehavior doesn't break business logic if outbox save fails.
     """
-    import logging
-
     with caplog.at_level(logging.ERROR):
         mock_mediator = AsyncMock()
         mock_mediator.send_command.side_effect = Exception("Outbox save failed")
@@ -454,32 +593,18 @@ async def test_outbox_behavior_set_mediator():
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_outbox_behavior_with_command_with_response(monkeypatch):
+async def test_outbox_behavior_with_command_with_response(
+    outbox_mediator, outbox_save_handler, prebuilt_events
+):
     """
     Test that OutboxBehavior processes ICommandWithResponse (not just ICommand).
     """
-    # Mock the SaveEventToOutboxCommand class
-    class MockSaveEventToOutboxCommand:
-        def __init__(self, event, correlation_id, db_session):
-            self.event = event
-            self.correlation_id = correlation_id
-            self.db_session = db_session
-
-    # Patch the import
-    import sys
-    from unittest.mock import MagicMock
-
-    mock_outbox_module = MagicMock()
-    mock_outbox_module.SaveEventToOutboxCommand = MockSaveEventToOutboxCommand
-    sys.modules["libs.buildingblocks.messaging.outbox_cqrs"] = mock_outbox_module
-
-    mock_mediator = AsyncMock()
-    behavior = OutboxBehavior(mediator=mock_mediator)
+    behavior = OutboxBehavior(mediator=outbox_mediator)
     db_session = Mock()
 
     class CommandWithResponse(ICommandWithResponse[str]):
         def __init__(self):
-            self.domain_events = [{"type": "EventFromCommandWithResponse"}]
+            self.domain_events = [prebuilt_events[2]]
             self.db_session = db_session
             self.correlation_id = "test-999"
 
@@ -487,5 +612,5 @@ async def test_outbox_behavior_with_command_with_response(monkeypatch):
     result = await behavior.handle(command, success_handler)
 
     assert result == "success"
-    assert mock_mediator.send_command.called
+    assert len(outbox_save_handler.commands) == 1
     print("✅ OutboxBehavior processed ICommandWithResponse")
@@ -0,0 +1,92 @@
+"""
+Unit tests for the denormalized Workspace credit balance
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from itertools import count
+
+import pytest
+from models.pricing import (
+    CreditTransaction,
+    PricingTier,
+    TransactionType,
+    Workspace,
+    backfill_workspace_credit_balances,
+)
+from models.user import Base
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+_transaction_ids = count(1)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def workspace(session):
+    tier = PricingTier(tier_code="starter", display_name="Starter")
+    session.add(tier)
+    session.flush()
+    workspace = Workspace(workspace_name="Acme", owner_id=uuid.uuid4(), tier_id=tier.tier_id)
+    session.add(workspace)
+    session.commit()
+    return workspace
+
+
+def credit_row(workspace_id, credits_delta):
+    # SQLite has no identity/gen_random_uuid defaults, so supply the keys explicitly
+    transaction_id = next(_transaction_ids)
+    return {
+        "transaction_id": transaction_id,
+        "public_id": uuid.uuid4(),
+        "workspace_id": workspace_id,
+        "transaction_type": TransactionType.PURCHASE,
+        "credits_delta": credits_delta,
+        "balance_after": 0,
+        "created_at": datetime(2025, 1, 1, tzinfo=UTC) + timedelta(seconds=transaction_id),
+    }
+
+
+@pytest.mark.unit
+def test_credit_transaction_updates_loaded_workspace_balance(session, workspace):
+    """
+    Test that a Workspace already loaded in the session sees the new balance.
+    """
+    assert workspace.current_balance_credits == 0
+
+    session.add(CreditTransaction(**credit_row(workspace.workspace_id, 100)))
+    session.add(CreditTransaction(**credit_row(workspace.workspace_id, -30)))
+    session.flush()
+
+    assert workspace.current_balance_credits == 70
+    session.commit()
+    session.expire_all()
+    assert workspace.current_balance_credits == 70
+    print("✅ Loaded Workspace saw the updated credit balance")
+
+
+@pytest.mark.unit
+def test_backfill_recomputes_balance_after_core_insert(session, workspace):
+    """
+    Test that the backfill counts credit transactions inserted outside the ORM.
+    """
+    session.execute(
+        insert(CreditTransaction.__table__),
+        [credit_row(workspace.workspace_id, 50), credit_row(workspace.workspace_id, 25)],
+    )
+    session.commit()
+    assert workspace.current_balance_credits == 0
+
+    backfill_workspace_credit_balances(session.connection())
+    session.commit()
+
+    assert workspace.current_balance_credits == 75
+    print("✅ Backfill recomputed the credit balance")
@@ -0,0 +1,221 @@
+"""
+Unit tests for the in-process pricing cache
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fakeredis import aioredis
+from models import pricing_cache as pricing_cache_module
+from models.pricing import FeatureDefinition, FeaturePricingRule, PricingTier
+from models.pricing_cache import (
+    INVALIDATION_CHANNEL,
+    LARGE_INPUT_BYTES,
+    PricingCache,
+    TTLDict,
+    build_credit_calculator,
+)
+from models.user import Base
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def tier(session):
+    tier = PricingTier(tier_code="pro", display_name="Pro")
+    session.add(tier)
+    session.add(FeatureDefinition(feature_code="ocr", display_name="OCR", category="vision"))
+    session.commit()
+    return tier
+
+
+def add_rule(session, tier_id=None, credits_per_use=10, priority=0, **kwargs):
+    kwargs.setdefault("valid_from", datetime.now(UTC) - timedelta(days=1))
+    rule = FeaturePricingRule(
+        feature_code="ocr",
+        tier_id=tier_id,
+        credits_per_use=credits_per_use,
+        priority=priority,
+        **kwargs,
+    )
+    session.add(rule)
+    session.commit()
+    return rule
+
+
+def pricing_rule(credits_per_use, multiplier=None, threshold=None, rate=None):
+    return FeaturePricingRule(
+        feature_code="ocr",
+        credits_per_use=credits_per_use,
+        input_size_multiplier=multiplier,
+        bulk_discount_threshold=threshold,
+        bulk_discount_rate=rate,
+    )
+
+
+@pytest.mark.unit
+def test_credit_calculator_without_dynamic_pricing():
+    """
+    Test that a rule with a 1.00 multiplier and no complete bulk discount charges a flat rate.
+    """
+    compute = build_credit_calculator(pricing_rule(3, Decimal("1.00"), threshold=10))
+
+    assert compute(0, 1) == 3
+    assert compute(LARGE_INPUT_BYTES + 1, 11) == 3
+    print("✅ Flat-rate calculator ignored size and volume")
+
+
+@pytest.mark.unit
+def test_credit_calculator_size_multiplier_only():
+    """
+    Test that only inputs strictly above LARGE_INPUT_BYTES are scaled, truncated to int.
+    """
+    compute = build_credit_calculator(pricing_rule(3, Decimal("1.50")))
+
+    assert compute(LARGE_INPUT_BYTES, 1) == 3
+    assert compute(LARGE_INPUT_BYTES + 1, 1) == 4  # int(4.5)
+    assert compute(LARGE_INPUT_BYTES + 1, 1_000) == 4
+    print("✅ Size multiplier applied above the large-input boundary")
+
+
+@pytest.mark.unit
+def test_credit_calculator_bulk_discount_only():
+    """
+    Test that only use counts strictly above the threshold are discounted, truncated to int.
+    """
+    compute = build_credit_calculator(pricing_rule(3, threshold=100, rate=Decimal("0.80")))
+
+    assert compute(0, 100) == 3
+    assert compute(0, 101) == 2  # int(2.4)
+    assert compute(LARGE_INPUT_BYTES + 1, 101) == 2
+    print("✅ Bulk discount applied above the threshold")
+
+
+@pytest.mark.unit
+def test_credit_calculator_size_multiplier_and_bulk_discount():
+    """
+    Test that the size multiplier is applied and truncated before the bulk discount.
+    """
+    compute = build_credit_calculator(
+        pricing_rule(3, Decimal("1.50"), threshold=100, rate=Decimal("0.75"))
+    )
+
+    assert compute(LARGE_INPUT_BYTES, 100) == 3
+    assert compute(LARGE_INPUT_BYTES + 1, 100) == 4  # int(4.5)
+    assert compute(LARGE_INPUT_BYTES, 101) == 2  # int(2.25)
+    assert compute(LARGE_INPUT_BYTES + 1, 101) == 3  # int(int(4.5) * 0.75)
+    print("✅ Size multiplier and bulk discount combined")
+
+
+@pytest.mark.unit
+def test_ttl_dict_expires_entries(monkeypatch):
+    """
+    Test that TTLDict entries are dropped once ttl_seconds have passed.
+    """
+    clock = [100.0]
+    monkeypatch.setattr(pricing_cache_module.time, "monotonic", lambda: clock[0])
+    entries = TTLDict(ttl_seconds=5)
+
+    entries.set("key", None)
+    clock[0] = 104.9
+    assert entries.get("key") is None
+
+    clock[0] = 105.0
+    assert entries.get("key") is pricing_cache_module._MISSING
+    print("✅ TTLDict entry expired after its TTL")
+
+
+@pytest.mark.unit
+def test_pricing_rule_compares_naive_sqlite_datetimes(session, tier):
+    """
+    Test that rules loaded from SQLite (naive datetimes) are matched against an aware now.
+    """
+    add_rule(session, valid_until=datetime.now(UTC) + timedelta(days=1))
+    cache = PricingCache()
+
+    compute = cache.get_credit_calculator(session, "ocr", tier.tier_id)
+
+    assert compute is not None
+    assert compute(0, 1) == 10
+    later = datetime.now(UTC) + timedelta(days=2)
+    assert cache.get_pricing_rule(session, "ocr", tier.tier_id, later) is None
+    print("✅ Naive stored validity dates compared as UTC")
+
+
+@pytest.mark.unit
+def test_tier_specific_rule_wins_at_equal_priority(session, tier):
+    """
+    Test that a tier-specific rule beats an all-tier rule of the same priority, not a higher one.
+    """
+    add_rule(session, tier_id=None, credits_per_use=10)
+    add_rule(session, tier_id=tier.tier_id, credits_per_use=7)
+
+    cache = PricingCache()
+    assert cache.get_pricing_rule(session, "ocr", tier.tier_id).credits_per_use == 7
+    assert cache.get_pricing_rule(session, "ocr", None).credits_per_use == 10
+
+    add_rule(session, tier_id=None, credits_per_use=5, priority=1)
+    cache.invalidate()
+    assert cache.get_pricing_rule(session, "ocr", tier.tier_id).credits_per_use == 5
+    print("✅ Rule priority, then tier specificity, picked the rule")
+
+
+@pytest.mark.unit
+def test_missing_rows_are_cached_until_invalidate(session, tier):
+    """
+    Test that a None lookup is cached and that invalidate() drops it.
+    """
+    cache = PricingCache()
+    assert cache.get_feature(session, "detect") is None
+    assert cache.get_pricing_rule(session, "ocr", tier.tier_id) is None
+
+    session.add(FeatureDefinition(feature_code="detect", display_name="Detect", category="vision"))
+    session.commit()
+    add_rule(session)
+    assert cache.get_feature(session, "detect") is None
+    assert cache.get_pricing_rule(session, "ocr", tier.tier_id) is None
+
+    cache.invalidate()
+    assert cache.get_feature(session, "detect").display_name == "Detect"
+    assert cache.get_pricing_rule(session, "ocr", tier.tier_id).credits_per_use == 10
+    print("✅ Negative lookups cached until invalidate()")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_published_invalidation_clears_other_caches(session, tier):
+    """
+    Test that publish_invalidation clears a cache listening on the same Redis channel.
+    """
+    redis_client = aioredis.FakeRedis()
+    listener, publisher = PricingCache(), PricingCache()
+    assert listener.get_tier(session, tier.tier_id).tier_code == "pro"
+
+    listen_task = asyncio.create_task(listener.listen_for_invalidations(redis_client))
+    try:
+        while not (await redis_client.pubsub_numsub(INVALIDATION_CHANNEL))[0][1]:
+            await asyncio.sleep(0.01)
+
+        await publisher.publish_invalidation(redis_client)
+        for _ in range(100):
+            if listener._tiers.get(tier.tier_id) is pricing_cache_module._MISSING:
+                break
+            await asyncio.sleep(0.01)
+        assert listener._tiers.get(tier.tier_id) is pricing_cache_module._MISSING
+    finally:
+        listen_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listen_task
+        await redis_client.aclose()
+    print("✅ Listener dropped its cache on a published invalidation")